@@ -51,7 +51,7 @@ def create_app() -> FastAPI:
     # Global exception handler
     @app.exception_handler(Exception)
     async def global_exception_handler(request, exc):
-        logger.error(f"Global exception handler caught: {exc}")
+        logger.error(f"Global exception handler caught: {exc}", exc_info=exc)
         return JSONResponse(
             status_code=500,
             content={
@@ -1,13 +1,21 @@
 """Authentication routes for OAuth 2.0 and JWT."""
 
-from datetime import timedelta
-from typing import Any, Dict, List, Optional
-
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status, Form
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
 from pydantic import BaseModel
 
-from ..services.auth import auth_service
+from ..services.auth import UserRecord, auth_service
 
 
 # Pydantic models
@@ -40,21 +48,117 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+@dataclass(slots=True)
+class AuthContext:
+    """Authenticated request state resolved from a bearer token."""
+    user: UserRecord
+    payload: Dict[str, Any]
+    token: str
+    scopes: FrozenSet[str]
+
+
 # Security schemes
 bearer_scheme = HTTPBearer()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 # Create auth router
-auth_router = APIRouter(prefix="/auth", tags=["authentication"])
+auth_router = APIRouter(
+    prefix="/auth",
+    tags=["authentication"],
+    default_response_class=ORJSONResponse
+)
+
+# Fields shared by every token response
+_ACCESS_TOKEN_EXPIRES = timedelta(minutes=auth_service.access_token_expire_minutes)
+_ACCESS_TTL_SEC = int(_ACCESS_TOKEN_EXPIRES.total_seconds())
+_TOKEN_BASE = {"token_type": "bearer", "expires_in": _ACCESS_TTL_SEC}
+
+# Token responses are built here from trusted values, so they skip response
+# validation; Token is still advertised in the OpenAPI schema. Keep the flows'
+# dicts in sync with Token by hand.
+_TOKEN_RESPONSE = {"response_model": None, "responses": {200: {"model": Token}}}
+
+# Bound once so hot paths skip the module -> instance -> method lookup chain
+_active_tokens = auth_service.active_tokens
+_verify = auth_service.verify_token
+_get_user = auth_service.get_user
+_create_access = auth_service.create_access_token
+_create_refresh = auth_service.create_refresh_token
+
+# Verified JWT payloads keyed by sha256(token) so raw tokens are never held here.
+# Entries are re-checked against "exp" on every hit.
+_token_cache: TTLCache = TTLCache(
+    maxsize=10000,
+    ttl=int(os.environ.get("JWT_CACHE_TTL", "30"))
+)
+_token_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=512)
+def _parse_scopes(scope: str) -> FrozenSet[str]:
+    """Parse a space-delimited OAuth scope string."""
+    return frozenset(scope.split()) if scope else frozenset()
+
+
+def _grant_scopes(requested: FrozenSet[str], allowed: FrozenSet[str]) -> str:
+    """Return the granted scope string: requested & allowed, or all allowed if none requested."""
+    granted = requested & allowed if requested else allowed
+    return " ".join(sorted(granted))
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Return the cache key for a bearer token."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _verify_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a JWT, skipping signature checks for recently verified tokens."""
+    key = _token_cache_key(token)
+    with _token_cache_lock:
+        cached: Optional[Tuple[Dict[str, Any], float]] = _token_cache.get(key)
+    
+    if cached is not None:
+        payload, exp = cached
+        # Revocation still applies: the token must remain in the active store
+        if exp > time.time() and token in _active_tokens:
+            return payload
+        with _token_cache_lock:
+            _token_cache.pop(key, None)
+    
+    payload = _verify(token)
+    if payload is None:
+        # Never cache failed verifications
+        return None
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        with _token_cache_lock:
+            _token_cache[key] = (payload, exp)
+    
+    return payload
+
+
+def _prime_token_cache(token: str) -> None:
+    """Cache the claims of a token we just signed so its first use skips decoding."""
+    entry = _active_tokens.get(token)
+    if entry is None:
+        return
+    # Match what jwt.decode would return: datetimes become epoch seconds
+    payload = {
+        k: int(v.timestamp()) if isinstance(v, datetime) else v
+        for k, v in entry["data"].items()
+    }
+    with _token_cache_lock:
+        _token_cache[_token_cache_key(token)] = (payload, payload["exp"])
 
 
-async def get_current_user(
+async def resolve_auth(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
-) -> Dict[str, Any]:
-    """Get current authenticated user from JWT token."""
+) -> AuthContext:
+    """Verify the bearer token and resolve its user once per request."""
     token = credentials.credentials
     
-    payload = auth_service.verify_token(token)
+    payload = _verify_token_cached(token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,7 +174,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = auth_service.users_db.get(username)
+    user = _get_user(username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -78,51 +182,81 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user
+    return AuthContext(
+        user=user,
+        payload=payload,
+        token=token,
+        scopes=user.scopes
+    )
 
 
-async def get_current_active_user(
-    current_user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
-    """Get current active user."""
-    if not current_user.get("is_active"):
+async def get_active_auth(
+    ctx: AuthContext = Depends(resolve_auth)
+) -> AuthContext:
+    """Get auth context for an active user."""
+    if not ctx.user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="Inactive user"
         )
-    return current_user
+    return ctx
+
+
+async def get_current_user(
+    ctx: AuthContext = Depends(resolve_auth)
+) -> UserRecord:
+    """Get current authenticated user from JWT token."""
+    return ctx.user
+
+
+async def get_current_active_user(
+    ctx: AuthContext = Depends(get_active_auth)
+) -> UserRecord:
+    """Get current active user."""
+    return ctx.user
 
 
 def check_scopes(required_scopes: List[str]):
     """Dependency to check if user has required scopes."""
+    required = frozenset(required_scopes)
+    
     async def _check_scopes(
-        current_user: Dict[str, Any] = Depends(get_current_active_user)
+        ctx: AuthContext = Depends(get_active_auth)
     ):
-        user_scopes = current_user.get("scopes", [])
-        for scope in required_scopes:
-            if scope not in user_scopes:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Not enough permissions. Required scope: {scope}"
-                )
-        return current_user
+        if not required.issubset(ctx.scopes):
+            missing = required.difference(ctx.scopes)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Not enough permissions. Required scope: {next(iter(missing))}"
+            )
+        return ctx.user
     return _check_scopes
 
 
-@auth_router.post("/token", response_model=Token)
-async def login_for_access_token(
-    username: str = Form(...),
-    password: str = Form(...),
-    grant_type: str = Form(default="password"),
-    scope: str = Form(default="")
-):
-    """OAuth 2.0 token endpoint (password grant)."""
-    
-    if grant_type != "password":
+@dataclass(slots=True)
+class TokenForm:
+    """Form fields accepted by the token endpoint; each grant reads its own."""
+    grant_type: str
+    scope: str = ""
+    username: Optional[str] = None
+    password: Optional[str] = None
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    refresh_token: Optional[str] = None
+
+
+def _require_field(value: Optional[str], name: str) -> str:
+    if not value:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unsupported grant type"
+            detail=f"Missing required field: {name}"
         )
+    return value
+
+
+async def _password_flow(form: TokenForm) -> Dict[str, Any]:
+    username = _require_field(form.username, "username")
+    password = _require_field(form.password, "password")
     
     user = auth_service.authenticate_user(username, password)
     if not user:
@@ -132,74 +266,65 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Parse requested scopes
-    requested_scopes = scope.split() if scope else []
-    user_scopes = user.get("scopes", [])
-    
-    # Grant only scopes that user has
-    granted_scopes = [s for s in requested_scopes if s in user_scopes]
-    if not requested_scopes:  # If no scopes requested, grant all user scopes
-        granted_scopes = user_scopes
+    # Grant only scopes that user has (all of them if none requested)
+    scope_str = _grant_scopes(_parse_scopes(form.scope), user.scopes)
     
     # Create tokens
-    access_token_expires = timedelta(minutes=auth_service.access_token_expire_minutes)
-    access_token = auth_service.create_access_token(
-        data={"sub": user["username"], "scopes": granted_scopes},
-        expires_delta=access_token_expires
+    access_token = _create_access(
+        data={"sub": user.username},
+        expires_delta=_ACCESS_TOKEN_EXPIRES,
+        scope=scope_str
     )
+    _prime_token_cache(access_token)
     
-    refresh_token = auth_service.create_refresh_token(
-        data={"sub": user["username"], "scopes": granted_scopes}
+    refresh_token = _create_refresh(
+        data={"sub": user.username},
+        scope=scope_str
     )
     
     return {
+        **_TOKEN_BASE,
         "access_token": access_token,
-        "token_type": "bearer",
-        "expires_in": auth_service.access_token_expire_minutes * 60,
         "refresh_token": refresh_token,
-        "scope": " ".join(granted_scopes)
+        "scope": scope_str
     }
 
 
-@auth_router.post("/login", response_model=Token)
-async def login(request: LoginRequest):
-    """Login with username and password (alternative to OAuth 2.0 token endpoint)."""
+async def _client_credentials_flow(form: TokenForm) -> Dict[str, Any]:
+    client_id = _require_field(form.client_id, "client_id")
+    client_secret = _require_field(form.client_secret, "client_secret")
     
-    user = auth_service.authenticate_user(request.username, request.password)
-    if not user:
+    client = auth_service.authenticate_client(client_id, client_secret)
+    if not client:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password"
+            detail="Invalid client credentials"
         )
     
-    # Grant all user scopes
-    user_scopes = user.get("scopes", [])
-    
-    # Create tokens
-    access_token_expires = timedelta(minutes=auth_service.access_token_expire_minutes)
-    access_token = auth_service.create_access_token(
-        data={"sub": user["username"], "scopes": user_scopes},
-        expires_delta=access_token_expires
+    scope_str = _grant_scopes(
+        _parse_scopes(form.scope),
+        client.get("allowed_scopes", frozenset())
     )
     
-    refresh_token = auth_service.create_refresh_token(
-        data={"sub": user["username"], "scopes": user_scopes}
+    # Create access token for client
+    access_token = _create_access(
+        data={"sub": client_id, "type": "client"},
+        expires_delta=_ACCESS_TOKEN_EXPIRES,
+        scope=scope_str
     )
+    _prime_token_cache(access_token)
     
     return {
+        **_TOKEN_BASE,
         "access_token": access_token,
-        "token_type": "bearer", 
-        "expires_in": auth_service.access_token_expire_minutes * 60,
-        "refresh_token": refresh_token,
-        "scope": " ".join(user_scopes)
+        "scope": scope_str
     }
 
 
-@auth_router.post("/refresh", response_model=Token)
-async def refresh_token(request: RefreshTokenRequest):
-    """Refresh access token using refresh token."""
+async def _refresh_token_flow(form: TokenForm) -> Dict[str, Any]:
+    refresh = _require_field(form.refresh_token, "refresh_token")
     
-    payload = auth_service.verify_token(request.refresh_token)
+    payload = _verify(refresh)
     if not payload or payload.get("type") != "refresh":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -207,62 +332,146 @@ async def refresh_token(request: RefreshTokenRequest):
         )
     
     username = payload.get("sub")
-    scopes = payload.get("scopes", [])
+    scope_str = payload.get("scope")
+    if scope_str is None:
+        # Refresh tokens issued before the "scope" claim carry a list
+        scope_str = " ".join(payload.get("scopes", []))
     
     # Create new access token
-    access_token_expires = timedelta(minutes=auth_service.access_token_expire_minutes)
-    access_token = auth_service.create_access_token(
-        data={"sub": username, "scopes": scopes},
-        expires_delta=access_token_expires
+    access_token = _create_access(
+        data={"sub": username},
+        expires_delta=_ACCESS_TOKEN_EXPIRES,
+        scope=scope_str
     )
+    _prime_token_cache(access_token)
     
     return {
+        **_TOKEN_BASE,
         "access_token": access_token,
-        "token_type": "bearer",
-        "expires_in": auth_service.access_token_expire_minutes * 60,
-        "scope": " ".join(scopes)
+        "scope": scope_str
     }
 
 
-@auth_router.post("/revoke")
-async def revoke_token(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+_GRANT_HANDLERS = {
+    "password": _password_flow,
+    "client_credentials": _client_credentials_flow,
+    "refresh_token": _refresh_token_flow,
+}
+
+
+async def _dispatch_grant(form: TokenForm) -> Dict[str, Any]:
+    handler = _GRANT_HANDLERS.get(form.grant_type)
+    if handler is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported grant type"
+        )
+    return await handler(form)
+
+
+@auth_router.post("/token", **_TOKEN_RESPONSE)
+async def login_for_access_token(
+    grant_type: str = Form(default="password"),
+    username: Optional[str] = Form(default=None),
+    password: Optional[str] = Form(default=None),
+    client_id: Optional[str] = Form(default=None),
+    client_secret: Optional[str] = Form(default=None),
+    refresh_token: Optional[str] = Form(default=None),
+    scope: str = Form(default="")
 ):
+    """OAuth 2.0 token endpoint (password, client_credentials and refresh_token grants)."""
+    return await _dispatch_grant(TokenForm(
+        grant_type=grant_type,
+        scope=scope,
+        username=username,
+        password=password,
+        client_id=client_id,
+        client_secret=client_secret,
+        refresh_token=refresh_token
+    ))
+
+
+@auth_router.post("/login", **_TOKEN_RESPONSE)
+async def login(request: LoginRequest):
+    """Login with username and password (alternative to OAuth 2.0 token endpoint)."""
+    
+    user = auth_service.authenticate_user(request.username, request.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password"
+        )
+    
+    # Grant all user scopes
+    scope_str = " ".join(user.scopes_list)
+    
+    # Create tokens
+    access_token = _create_access(
+        data={"sub": user.username},
+        expires_delta=_ACCESS_TOKEN_EXPIRES,
+        scope=scope_str
+    )
+    _prime_token_cache(access_token)
+    
+    refresh_token = _create_refresh(
+        data={"sub": user.username},
+        scope=scope_str
+    )
+    
+    return {
+        **_TOKEN_BASE,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "scope": scope_str
+    }
+
+
+@auth_router.post("/refresh", **_TOKEN_RESPONSE)
+async def refresh_token(request: RefreshTokenRequest):
+    """Refresh access token using refresh token."""
+    return await _refresh_token_flow(
+        TokenForm(grant_type="refresh_token", refresh_token=request.refresh_token)
+    )
+
+
+@auth_router.post("/revoke")
+async def revoke_token(ctx: AuthContext = Depends(resolve_auth)):
     """Revoke current token."""
-    token = credentials.credentials
-    success = auth_service.revoke_token(token)
+    with _token_cache_lock:
+        _token_cache.pop(_token_cache_key(ctx.token), None)
+    success = auth_service.revoke_token(ctx.token)
+    auth_service.invalidate_user(ctx.user.username)
     
     return {"revoked": success}
 
 
 @auth_router.get("/me", response_model=User)
 async def get_current_user_info(
-    current_user: Dict[str, Any] = Depends(get_current_active_user)
+    current_user: UserRecord = Depends(get_current_active_user)
 ):
     """Get current user information."""
     return User(
-        username=current_user["username"],
-        email=current_user["email"],
-        is_active=current_user["is_active"],
-        scopes=current_user["scopes"]
+        username=current_user.username,
+        email=current_user.email,
+        is_active=current_user.is_active,
+        scopes=list(current_user.scopes_list)
     )
 
 
 @auth_router.get("/protected")
 async def protected_endpoint(
-    current_user: Dict[str, Any] = Depends(get_current_active_user)
+    current_user: UserRecord = Depends(get_current_active_user)
 ):
     """Example protected endpoint."""
-    return {"message": f"Hello {current_user['username']}, this is a protected endpoint!"}
+    return {"message": f"Hello {current_user.username}, this is a protected endpoint!"}
 
 
 @auth_router.get("/admin-only")
 async def admin_only_endpoint(
-    current_user: Dict[str, Any] = Depends(check_scopes(["admin"]))
+    current_user: UserRecord = Depends(check_scopes(["admin"]))
 ):
     """Example admin-only endpoint."""
-    return {"message": f"Hello admin {current_user['username']}! This is an admin-only endpoint."}
+    return {"message": f"Hello admin {current_user.username}! This is an admin-only endpoint."}
 
 
 # OAuth 2.0 Authorization Code Flow endpoints
@@ -290,58 +499,39 @@ async def authorize(
             detail="Invalid redirect_uri"
         )
     
-    requested_scopes = scope.split() if scope else []
-    allowed_scopes = [s for s in requested_scopes if s in client["allowed_scopes"]]
+    requested_scopes = _parse_scopes(scope)
+    allowed_scopes = tuple(sorted(requested_scopes & client["allowed_scopes"]))
     
     return {
         "client_id": client_id,
         "redirect_uri": redirect_uri,
-        "requested_scopes": requested_scopes,
+        "requested_scopes": sorted(requested_scopes),
         "allowed_scopes": allowed_scopes,
         "state": state,
         "message": "In a real implementation, this would show a consent page"
     }
 
 
-@auth_router.post("/token/client_credentials", response_model=Token)
+@auth_router.post("/token/client_credentials", deprecated=True, **_TOKEN_RESPONSE)
 async def client_credentials_token(
     client_id: str = Form(...),
     client_secret: str = Form(...),
     grant_type: str = Form(default="client_credentials"),
     scope: str = Form(default="")
 ):
-    """OAuth 2.0 client credentials grant."""
+    """OAuth 2.0 client credentials grant.
     
+    Deprecated: use ``POST /auth/token`` with ``grant_type=client_credentials``.
+    """
     if grant_type != "client_credentials":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unsupported grant type"
         )
     
-    client = auth_service.authenticate_client(client_id, client_secret)
-    if not client:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid client credentials"
-        )
-    
-    requested_scopes = scope.split() if scope else []
-    allowed_scopes = client.get("allowed_scopes", [])
-    granted_scopes = [s for s in requested_scopes if s in allowed_scopes]
-    
-    if not requested_scopes:
-        granted_scopes = allowed_scopes
-    
-    # Create access token for client
-    access_token_expires = timedelta(minutes=auth_service.access_token_expire_minutes)
-    access_token = auth_service.create_access_token(
-        data={"sub": client_id, "scopes": granted_scopes, "type": "client"},
-        expires_delta=access_token_expires
-    )
-    
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "expires_in": auth_service.access_token_expire_minutes * 60,
-        "scope": " ".join(granted_scopes)
-    }
\ No newline at end of file
+    return await _dispatch_grant(TokenForm(
+        grant_type=grant_type,
+        scope=scope,
+        client_id=client_id,
+        client_secret=client_secret
+    ))
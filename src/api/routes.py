@@ -1,9 +1,11 @@
 """FastAPI HTTP routes for Naramarket services."""
 
+import asyncio
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import StreamingResponse
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from ..core.config import OUTPUT_DIR
@@ -16,6 +18,7 @@ from ..core.models import (
     MergeResult,
     SaveResultsResponse,
     ServerInfo,
+    ServiceResult,
     SummaryResult
 )
 from ..services.crawler import crawler_service
@@ -67,7 +70,25 @@ class MergeRequest(BaseModel):
 
 
 # Create API router
-router = APIRouter(prefix="/api/v1", tags=["naramarket"])
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["naramarket"],
+    default_response_class=ORJSONResponse
+)
+
+
+def _check(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Raise 400 for a failed tool result, otherwise return it."""
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    return result
+
+
+def _unwrap(result: ServiceResult) -> Any:
+    """Raise 400 for a failed service result, otherwise return its data."""
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.error)
+    return result.data
 
 
 @router.get("/", response_model=Dict[str, str])
@@ -85,105 +106,69 @@ async def get_server_info():
 @router.post("/crawl/list", response_model=CrawlListResult)
 async def crawl_product_list(request: CrawlListRequest):
     """Crawl product list from Naramarket API."""
-    try:
-        result = naramarket_tools.crawl_list(
-            category=request.category,
-            page_no=request.page_no,
-            num_rows=request.num_rows,
-            days_back=request.days_back,
-            inqry_bgn_date=request.inqry_bgn_date,
-            inqry_end_date=request.inqry_end_date
-        )
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _check(naramarket_tools.crawl_list(
+        category=request.category,
+        page_no=request.page_no,
+        num_rows=request.num_rows,
+        days_back=request.days_back,
+        inqry_bgn_date=request.inqry_bgn_date,
+        inqry_end_date=request.inqry_end_date
+    ))
 
 
 @router.post("/crawl/attributes", response_model=DetailResult)
 async def get_product_attributes(api_item: Dict[str, Any]):
     """Get detailed product attributes."""
-    try:
-        result = naramarket_tools.get_detailed_attributes(api_item)
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _check(naramarket_tools.get_detailed_attributes(api_item))
 
 
 @router.post("/crawl/csv", response_model=CrawlToCSVResult)
 async def crawl_to_csv_endpoint(request: CrawlToCSVRequest):
     """Crawl data and save directly to CSV."""
-    try:
-        result = crawler_service.crawl_to_csv(
-            category=request.category,
-            output_csv=request.output_csv,
-            total_days=request.total_days,
-            window_days=request.window_days,
-            anchor_end_date=request.anchor_end_date,
-            max_windows_per_call=request.max_windows_per_call,
-            max_runtime_sec=request.max_runtime_sec,
-            append=request.append,
-            fail_on_new_columns=request.fail_on_new_columns,
-            explode_attributes=request.explode_attributes,
-            sanitize=request.sanitize,
-            delay_sec=request.delay_sec,
-            keep_temp=request.keep_temp
-        )
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _unwrap(crawler_service.crawl_to_csv(
+        category=request.category,
+        output_csv=request.output_csv,
+        total_days=request.total_days,
+        window_days=request.window_days,
+        anchor_end_date=request.anchor_end_date,
+        max_windows_per_call=request.max_windows_per_call,
+        max_runtime_sec=request.max_runtime_sec,
+        append=request.append,
+        fail_on_new_columns=request.fail_on_new_columns,
+        explode_attributes=request.explode_attributes,
+        sanitize=request.sanitize,
+        delay_sec=request.delay_sec,
+        keep_temp=request.keep_temp
+    ))
 
 
 @router.post("/files/save", response_model=SaveResultsResponse)
 async def save_results_endpoint(request: SaveResultsRequest):
     """Save products to JSON file."""
-    try:
-        result = file_processor_service.save_results(
-            request.products, 
-            request.filename, 
-            request.directory
-        )
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _unwrap(file_processor_service.save_results(
+        request.products, 
+        request.filename, 
+        request.directory
+    ))
 
 
 @router.post("/files/convert/parquet", response_model=ConvertResult)
 async def convert_to_parquet_endpoint(request: ConvertRequest):
     """Convert JSON file to Parquet format."""
-    try:
-        result = file_processor_service.convert_json_to_parquet(
-            request.json_path,
-            request.output_parquet,
-            request.explode_attributes
-        )
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _unwrap(file_processor_service.convert_json_to_parquet(
+        request.json_path,
+        request.output_parquet,
+        request.explode_attributes
+    ))
 
 
 @router.post("/files/merge", response_model=MergeResult)
 async def merge_csv_endpoint(request: MergeRequest):
     """Merge multiple CSV files."""
-    try:
-        result = file_processor_service.merge_csv_files(
-            request.input_pattern,
-            request.output_csv
-        )
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _unwrap(file_processor_service.merge_csv_files(
+        request.input_pattern,
+        request.output_csv
+    ))
 
 
 @router.get("/files/csv/{csv_path:path}/summary", response_model=SummaryResult)
@@ -192,13 +177,7 @@ async def summarize_csv_endpoint(
     max_rows_preview: int = Query(5, ge=1, le=100)
 ):
     """Get CSV file summary."""
-    try:
-        result = file_processor_service.summarize_csv(csv_path, max_rows_preview)
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error"))
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _unwrap(file_processor_service.summarize_csv_fast(csv_path, max_rows_preview))
 
 
 @router.get("/files/list", response_model=List[FileInfo])
@@ -207,10 +186,7 @@ async def list_files_endpoint(
     directory: str = Query(OUTPUT_DIR, description="Directory to search")
 ):
     """List files in directory."""
-    try:
-        return file_processor_service.list_files(pattern, directory)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return file_processor_service.list_files(pattern, directory)
 
 
 # Health check endpoint
@@ -221,31 +197,56 @@ async def health_check():
 
 
 # SSE endpoint for streaming crawl results
+# Strong references to in-flight crawl tasks so they survive client disconnects
+_background_tasks: set = set()
+
+
 @router.post("/crawl/csv/stream")
 async def stream_crawl_to_csv(request: CrawlToCSVRequest):
     """Stream crawling progress via Server-Sent Events."""
     async def event_generator():
-        # This would implement streaming progress updates
-        # For now, just yield the final result
-        result = crawler_service.crawl_to_csv(
-            category=request.category,
-            output_csv=request.output_csv,
-            total_days=request.total_days,
-            window_days=request.window_days,
-            anchor_end_date=request.anchor_end_date,
-            max_windows_per_call=request.max_windows_per_call,
-            max_runtime_sec=request.max_runtime_sec,
-            append=request.append,
-            fail_on_new_columns=request.fail_on_new_columns,
-            explode_attributes=request.explode_attributes,
-            sanitize=request.sanitize,
-            delay_sec=request.delay_sec,
-            keep_temp=request.keep_temp
-        )
-        yield f"data: {result}\n\n"
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        # The crawl runs in a worker thread, so hand events back to the loop
+        def progress_cb(event: Dict[str, Any]) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+        
+        async def run_crawl():
+            try:
+                result = await asyncio.to_thread(
+                    crawler_service.crawl_to_csv,
+                    category=request.category,
+                    output_csv=request.output_csv,
+                    total_days=request.total_days,
+                    window_days=request.window_days,
+                    anchor_end_date=request.anchor_end_date,
+                    max_windows_per_call=request.max_windows_per_call,
+                    max_runtime_sec=request.max_runtime_sec,
+                    append=request.append,
+                    fail_on_new_columns=request.fail_on_new_columns,
+                    explode_attributes=request.explode_attributes,
+                    sanitize=request.sanitize,
+                    delay_sec=request.delay_sec,
+                    keep_temp=request.keep_temp,
+                    progress_cb=progress_cb
+                )
+            except Exception as e:
+                result = ServiceResult.fail(str(e))
+            queue.put_nowait({"done": True, "result": result._asdict()})
+        
+        task = asyncio.create_task(run_crawl())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        
+        while True:
+            item = await queue.get()
+            yield f"data: {orjson.dumps(item, default=str).decode()}\n\n"
+            if item.get("done"):
+                break
     
     return StreamingResponse(
         event_generator(),
-        media_type="text/plain",
+        media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
-    )
\ No newline at end of file
+    )
@@ -7,13 +7,16 @@ from functools import wraps
 from typing import Any, Callable, Dict
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import (
     BASE_LIST_URL, 
+    DETAIL_CONCURRENCY,
     G2B_DETAIL_URL, 
     G2B_HEADERS,
     MAX_RETRIES, 
     RETRY_BACKOFF_BASE,
+    WINDOW_CONCURRENCY,
     get_service_key
 )
 
@@ -51,6 +54,14 @@ class NaramarketAPIClient:
     def __init__(self):
         self.service_key = get_service_key()
         self.session = requests.Session()
+        # Keep one pooled keep-alive connection per concurrent detail worker
+        # and window (list) worker so parallel calls don't reconnect each time
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=max(DETAIL_CONCURRENCY + WINDOW_CONCURRENCY, 10)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     @retryable
     def call_list_api(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -14,7 +14,12 @@ SERVER_VERSION = "2.0.0"  # FastMCP 2.0 버전
 DEFAULT_NUM_ROWS = 100
 DEFAULT_DELAY_SEC = 0.1
 DEFAULT_MAX_PAGES = 999
+DETAIL_CONCURRENCY = int(os.environ.get("DETAIL_CONCURRENCY", "8"))  # 페이지당 동시 상세 조회 수
+WINDOW_CONCURRENCY = int(os.environ.get("WINDOW_CONCURRENCY", "4"))  # 동시에 수집하는 날짜 구간 수
+RATE_LIMIT_BURST = int(os.environ.get("RATE_LIMIT_BURST", "8"))  # 호스트별 순간 최대 요청 수
+DETAIL_RATE_PER_SEC = float(os.environ.get("DETAIL_RATE_PER_SEC", "20"))  # 상세 조회 초당 최대 요청 수 (서비스 전체, 0 = 제한 없음)
 DATE_FMT = "%Y%m%d"
+OUTPUT_DIR = os.environ.get("OUTPUT_DIR", "output")  # CSV/JSON 결과 파일 저장 위치
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 0.75
 
@@ -1,9 +1,24 @@
 """Data models and TypedDict definitions for Naramarket FastMCP 2.0 Server."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Optional
 from typing_extensions import TypedDict
 
 
+class ServiceResult(NamedTuple):
+    """Outcome of a service call; ``data`` carries the response payload."""
+    success: bool
+    data: Any = None
+    error: Optional[str] = None
+    
+    @classmethod
+    def ok(cls, data: Any) -> "ServiceResult":
+        return cls(True, data, None)
+    
+    @classmethod
+    def fail(cls, error: str, data: Any = None) -> "ServiceResult":
+        return cls(False, data, error)
+
+
 class CrawlListResult(TypedDict, total=False):
     """Result structure for crawl list operations."""
     success: bool
@@ -41,6 +56,7 @@ class OpenAPIResponse(TypedDict, total=False):
     """Generic OpenAPI response structure."""
     endpoint: str
     params: Dict[str, Any]
+    url: str  # endpoint with params already query-encoded
     description: str
     method: str
 
@@ -62,4 +78,78 @@ class ServerInfo(TypedDict, total=False):
     success: bool
     app: str
     version: str
-    tools: List[str]
\ No newline at end of file
+    tools: List[str]
+
+
+class CrawlToCSVResult(TypedDict, total=False):
+    """Result structure for windowed crawl-to-CSV operations."""
+    success: bool
+    category: str
+    output_csv: str
+    windows_processed: int
+    pages_processed: int
+    total_products: int
+    success_details: int
+    failed_details: int
+    incomplete: bool
+    remaining_days: int
+    next_anchor_end_date: Optional[str]
+    covered_days: int
+    rows: int
+    basic_columns: List[str]
+    attr_columns: List[str]
+    explode_attributes: bool
+    sanitize: bool
+    append_mode: bool
+    existing_header_used: bool
+    csv_engine: str
+    elapsed_sec: float
+    temp_deleted: bool
+    temp_file: str
+    error: str
+
+
+class SaveResultsResponse(TypedDict, total=False):
+    """Result structure for saving products to a JSON file."""
+    success: bool
+    filename: str
+    products_count: int
+    error: str
+
+
+class ConvertResult(TypedDict, total=False):
+    """Result structure for JSON to Parquet conversion."""
+    success: bool
+    input_file: str
+    output_file: str
+    rows_converted: int
+    error: str
+
+
+class MergeResult(TypedDict, total=False):
+    """Result structure for CSV merge operations."""
+    success: bool
+    input_files: List[str]
+    output_file: str
+    total_rows: int
+    error: str
+
+
+class SummaryResult(TypedDict, total=False):
+    """Result structure for CSV summaries."""
+    success: bool
+    file_path: str
+    rows: int
+    columns: int
+    headers: List[str]
+    preview: List[Dict[str, Any]]
+    error: str
+
+
+class FileInfo(TypedDict, total=False):
+    """File listing entry."""
+    filename: str
+    path: str
+    size_bytes: int
+    modified_time: str
+    error: str
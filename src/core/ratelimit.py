@@ -0,0 +1,48 @@
+"""Token bucket rate limiting for outbound API calls."""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Allows bursts of up to ``burst`` calls, then refills at ``rate_per_sec``.
+    A rate of None (or <= 0) disables limiting. Waiters block on a
+    ``threading.Condition`` so other threads keep making progress.
+    """
+
+    def __init__(self, rate_per_sec: Optional[float] = None, burst: int = 1):
+        self.burst = max(1, int(burst))
+        self.rate_per_sec = rate_per_sec if rate_per_sec and rate_per_sec > 0 else None
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        if self.rate_per_sec is None:
+            self._tokens = float(self.burst)
+        else:
+            elapsed = now - self._updated
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate_per_sec)
+        self._updated = now
+
+    def set_rate(self, rate_per_sec: Optional[float]) -> None:
+        """Change the refill rate; None or <= 0 disables limiting."""
+        with self._cond:
+            self._refill(time.monotonic())
+            self.rate_per_sec = rate_per_sec if rate_per_sec and rate_per_sec > 0 else None
+            self._cond.notify_all()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until ``tokens`` are available, then consume them."""
+        with self._cond:
+            while True:
+                self._refill(time.monotonic())
+                if self.rate_per_sec is None:
+                    return
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                self._cond.wait((tokens - self._tokens) / self.rate_per_sec)
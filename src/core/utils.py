@@ -4,6 +4,7 @@ import os
 import re
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict
 
 from .config import DATE_FMT
@@ -51,6 +52,12 @@ def sanitize_column_name(name: str) -> str:
     """Sanitize column name for CSV/DataFrame usage."""
     if not isinstance(name, str):
         name = str(name)
+    return _sanitize_column_str(name)
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_column_str(name: str) -> str:
+    """Sanitize a str column name (cached; names repeat across rows)."""
     # Replace problematic characters with underscores
     name = re.sub(r'[^\w가-힣]', '_', name)
     # Remove multiple consecutive underscores
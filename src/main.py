@@ -1570,8 +1570,14 @@ def main():
                 max_age=86400,
             )
 
+            # uvloop/httptools outperform asyncio/h11; fall back when not installed
+            import importlib.util
+            loop_impl = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+            http_impl = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
             logger.info("Pure FastMCP server ready with enhanced CORS")
-            uvicorn.run(app, host=host, port=port)
+            logger.info(f"uvicorn loop={loop_impl} http={http_impl}")
+            uvicorn.run(app, host=host, port=port, loop=loop_impl, http=http_impl)
         elif transport == "sse":
             # SSE mode for real-time communication
             logger.info(f"Starting SSE transport on {host}:{port}")
@@ -2,16 +2,37 @@
 
 import os
 import secrets
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
 
 import jwt
+from cachetools import TTLCache
 from passlib.context import CryptContext
 from passlib.hash import bcrypt
 
 from ..core.config import APP_NAME
 
 
+@dataclass(slots=True, frozen=True)
+class UserRecord:
+    """Stored user account.
+    
+    ``scopes`` may be given as any iterable; it is stored as a frozenset for
+    membership checks, with ``scopes_list`` keeping the original order.
+    """
+    username: str
+    email: str
+    hashed_password: str
+    is_active: bool = True
+    scopes: Iterable[str] = frozenset()
+    scopes_list: Tuple[str, ...] = field(init=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "scopes_list", tuple(self.scopes))
+        object.__setattr__(self, "scopes", frozenset(self.scopes_list))
+
+
 class AuthService:
     """Authentication service for OAuth 2.0 and JWT tokens."""
     
@@ -33,30 +54,33 @@ class AuthService:
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         
         # Simple in-memory user store (replace with database in production)
-        self.users_db = {
-            "admin": {
-                "username": "admin",
-                "email": "admin@naramarket.local",
-                "hashed_password": self.get_password_hash("admin123"),
-                "is_active": True,
-                "scopes": ["read", "write", "admin"]
-            },
-            "user": {
-                "username": "user",
-                "email": "user@naramarket.local", 
-                "hashed_password": self.get_password_hash("user123"),
-                "is_active": True,
-                "scopes": ["read"]
-            }
+        self.users_db: Dict[str, UserRecord] = {
+            "admin": UserRecord(
+                username="admin",
+                email="admin@naramarket.local",
+                hashed_password=self.get_password_hash("admin123"),
+                is_active=True,
+                scopes=["read", "write", "admin"]
+            ),
+            "user": UserRecord(
+                username="user",
+                email="user@naramarket.local",
+                hashed_password=self.get_password_hash("user123"),
+                is_active=True,
+                scopes=["read"]
+            )
         }
         
+        # Short-lived cache in front of users_db lookups
+        self._user_cache: TTLCache = TTLCache(maxsize=5000, ttl=60)
+        
         # OAuth 2.0 clients (simple in-memory store)
         self.oauth_clients = {
             "naramarket_client": {
                 "client_id": "naramarket_client",
                 "client_secret": self.get_password_hash("client_secret_123"),
-                "allowed_scopes": ["read", "write"],
-                "redirect_uris": ["http://localhost:8000/callback"]
+                "allowed_scopes": frozenset(["read", "write"]),
+                "redirect_uris": frozenset(["http://localhost:8000/callback"])
             }
         }
         
@@ -71,16 +95,29 @@ class AuthService:
         """Verify a password against its hash."""
         return self.pwd_context.verify(plain_password, hashed_password)
     
-    def authenticate_user(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+    def get_user(self, username: str) -> Optional[UserRecord]:
+        """Get user by username, serving repeated lookups from cache."""
+        user = self._user_cache.get(username)
+        if user is None:
+            user = self.users_db.get(username)
+            if user is not None:
+                self._user_cache[username] = user
+        return user
+    
+    def invalidate_user(self, username: str) -> None:
+        """Drop a cached user so the next lookup reads users_db again."""
+        self._user_cache.pop(username, None)
+    
+    def authenticate_user(self, username: str, password: str) -> Optional[UserRecord]:
         """Authenticate user with username and password."""
         user = self.users_db.get(username)
         if not user:
             return None
         
-        if not self.verify_password(password, user["hashed_password"]):
+        if not self.verify_password(password, user.hashed_password):
             return None
         
-        if not user.get("is_active", False):
+        if not user.is_active:
             return None
         
         return user
@@ -99,10 +136,16 @@ class AuthService:
     def create_access_token(
         self, 
         data: Dict[str, Any], 
-        expires_delta: Optional[timedelta] = None
+        expires_delta: Optional[timedelta] = None,
+        scope: Optional[str] = None
     ) -> str:
-        """Create JWT access token."""
+        """Create JWT access token.
+        
+        ``scope`` is stored as a single space-delimited claim (RFC 6749).
+        """
         to_encode = data.copy()
+        if scope is not None:
+            to_encode["scope"] = scope
         
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
@@ -132,10 +175,13 @@ class AuthService:
     def create_refresh_token(
         self,
         data: Dict[str, Any],
-        expires_delta: Optional[timedelta] = None
+        expires_delta: Optional[timedelta] = None,
+        scope: Optional[str] = None
     ) -> str:
         """Create JWT refresh token."""
         to_encode = data.copy()
+        if scope is not None:
+            to_encode["scope"] = scope
         
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
@@ -237,8 +283,8 @@ class AuthService:
     
     def get_user_scopes(self, username: str) -> list:
         """Get user's authorized scopes."""
-        user = self.users_db.get(username)
-        return user.get("scopes", []) if user else []
+        user = self.get_user(username)
+        return list(user.scopes_list) if user else []
 
 
 # Global auth service instance
@@ -1,16 +1,46 @@
 """Crawling service for large-scale data collection."""
 
+import codecs
 import csv
+import glob
+import io
 import json
 import os
-import tempfile
+import shutil
 import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import count
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 from ..core.client import get_api_client
-from ..core.config import DATE_FMT, DEFAULT_DELAY_SEC, DEFAULT_MAX_PAGES, OUTPUT_DIR
-from ..core.models import CrawlToCSVResult
+from ..core.config import (
+    DATE_FMT,
+    DEFAULT_DELAY_SEC,
+    DEFAULT_MAX_PAGES,
+    DETAIL_CONCURRENCY,
+    DETAIL_RATE_PER_SEC,
+    OUTPUT_DIR,
+    RATE_LIMIT_BURST,
+    WINDOW_CONCURRENCY
+)
+from ..core.models import ServiceResult
+from ..core.ratelimit import TokenBucket
 from ..core.utils import (
     calculate_elapsed_time,
     ensure_dir,
@@ -18,13 +48,94 @@ from ..core.utils import (
     sanitize_column_name
 )
 
+# Temp NDJSON is written through a large file buffer, with records batched
+# into flushes of at least _TEMP_FLUSH_BYTES
+_TEMP_BUFFER_SIZE = 16 * 1024 * 1024
+_TEMP_FLUSH_BYTES = 4 * 1024 * 1024
+
+# Distinct str fields kept encoded while writing a CSV before the cache resets
+_CSV_FIELD_CACHE_SIZE = 65536
+
+# Row-builder source per column kind; ``r`` is the record, ``a`` its attributes
+_ROW_EXPRS = {
+    "record": "r.get({key!r}, '')",
+    "attribute": "a.get({key!r}, '')",
+    "attributes_json": "dumps(a).decode() if a else ''",
+    "flag": "'1' if r.get({key!r}) else '0'",
+    "missing": "''",
+}
+
+
+class _CsvRowEncoder:
+    """Encode rows to UTF-8 CSV lines the way csv.writer's excel dialect does.
+    
+    Encoded str fields are cached, since the same values (window dates,
+    flags, attribute values) recur on many rows. The cache is cleared
+    whenever it reaches ``max_size`` entries.
+    """
+    
+    __slots__ = ("_cache", "_max_size")
+    
+    def __init__(self, max_size: int = _CSV_FIELD_CACHE_SIZE):
+        self._cache: Dict[str, bytes] = {}
+        self._max_size = max_size
+    
+    @staticmethod
+    def _encode_field(text: str) -> bytes:
+        if ',' in text or '"' in text or '\n' in text or '\r' in text:
+            text = '"' + text.replace('"', '""') + '"'
+        return text.encode('utf-8')
+    
+    def encode_row(self, values: List[Any]) -> bytes:
+        cache = self._cache
+        fields = []
+        for value in values:
+            if value.__class__ is str:
+                encoded = cache.get(value)
+                if encoded is None:
+                    if len(cache) >= self._max_size:
+                        cache.clear()
+                    encoded = cache[value] = self._encode_field(value)
+            else:
+                encoded = self._encode_field("" if value is None else str(value))
+            fields.append(encoded)
+        if len(fields) == 1 and not fields[0]:
+            # csv.writer quotes a lone empty field so the line isn't blank
+            return b'""\r\n'
+        return b','.join(fields) + b'\r\n'
+
+
+@lru_cache(maxsize=32)
+def _compile_row_builder(exprs: Tuple[str, ...]) -> Callable[[Dict[str, Any], Dict[str, Any]], List[Any]]:
+    """Compile ``build_row(record, attributes)`` returning one value per expression.
+    
+    A single straight-line list display avoids a Python call per column;
+    builders are cached by their expressions, i.e. by the output schema.
+    """
+    source = f"def build_row(r, a):\n    return [{', '.join(exprs)}]\n"
+    namespace: Dict[str, Any] = {"dumps": orjson.dumps}
+    exec(compile(source, "<crawler row builder>", "exec"), namespace)
+    return namespace["build_row"]
+
 
 class CrawlingService:
     """Service for handling large-scale crawling operations."""
     
     def __init__(self):
         self.client = get_api_client()
+        self._detail_pool = ThreadPoolExecutor(
+            max_workers=DETAIL_CONCURRENCY,
+            thread_name_prefix="detail"
+        )
+        # Request budget: each crawl paces its own list calls at 1/delay_sec
+        # (a bucket per call, so concurrent crawls don't reset each other),
+        # while detail calls from all crawls share one fixed host-wide rate
+        self._detail_bucket = TokenBucket(DETAIL_RATE_PER_SEC, burst=RATE_LIMIT_BURST)
         ensure_dir(OUTPUT_DIR)
+        # Long-lived scratch directory for temp NDJSON files
+        self._scratch_dir = os.path.join(OUTPUT_DIR, ".scratch")
+        ensure_dir(self._scratch_dir)
+        self._run_ids = count()
     
     def crawl_to_csv(
         self,
@@ -40,8 +151,10 @@ class CrawlingService:
         explode_attributes: bool = False,
         sanitize: bool = True,
         delay_sec: float = DEFAULT_DELAY_SEC,
-        keep_temp: bool = False
-    ) -> CrawlToCSVResult:
+        keep_temp: bool = False,
+        progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None,
+        csv_engine: str = "python"
+    ) -> ServiceResult:
         """
         Crawl category data in windows and save directly to CSV.
         
@@ -57,19 +170,41 @@ class CrawlingService:
             fail_on_new_columns: Fail if new columns detected in append mode
             explode_attributes: Expand attributes as separate columns
             sanitize: Sanitize column names
-            delay_sec: Delay between requests
+            delay_sec: Pacing between this crawl's list API calls
+                (rate = 1/delay_sec); detail calls are capped service-wide
+                by ``DETAIL_RATE_PER_SEC`` instead
             keep_temp: Keep temporary files for debugging
+            progress_cb: Called with a progress dict after each window
+            csv_engine: "pyarrow" converts with Arrow's JSON reader and CSV
+                writer (exploded attributes only; string cells are written
+                quoted). Falls back to "python" when a value isn't text.
+            
+        Progress is checkpointed to ``{output_csv}.ckpt`` after every window.
+        If a previous call died mid-crawl, calling again without
+        ``anchor_end_date`` resumes from the last finished window.
             
         Returns:
-            CrawlToCSVResult with detailed execution information
+            ServiceResult whose data is a CrawlToCSVResult with detailed
+            execution information
         """
         start_time = time.time()
         
+        list_bucket = TokenBucket(
+            1.0 / delay_sec if delay_sec > 0 else None, burst=RATE_LIMIT_BURST
+        )
+        
         if not output_csv.startswith('/'):
             output_csv = os.path.join(OUTPUT_DIR, output_csv)
         
+        checkpoint_path = f"{output_csv}.ckpt"
+        resume = None
+        if not anchor_end_date:
+            resume = self._load_checkpoint(checkpoint_path, category)
+        
         # Determine date range
-        if anchor_end_date:
+        if resume is not None:
+            end_date = datetime.fromisoformat(resume["end_date"])
+        elif anchor_end_date:
             end_date = datetime.strptime(anchor_end_date, DATE_FMT)
         else:
             end_date = datetime.now()
@@ -84,15 +219,26 @@ class CrawlingService:
                     reader = csv.reader(f)
                     existing_header = next(reader, None)
             except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"Failed to read existing CSV header: {e}",
-                    "output_csv": output_csv
-                }
+                return ServiceResult.fail(
+                    f"Failed to read existing CSV header: {e}",
+                    {"output_csv": output_csv}
+                )
+        
+        # Create temporary NDJSON file for intermediate storage, or pick up
+        # the one a checkpointed crawl left behind
+        if resume is not None:
+            temp_ndjson = resume["temp_ndjson"]
+        else:
+            # zstd-compressed when available; readers go by the extension
+            temp_ndjson = os.path.join(
+                self._scratch_dir,
+                f"crawl_{int(time.time())}_{os.getpid()}_{next(self._run_ids)}"
+                f"{'.ndjson.zst' if ZSTD_AVAILABLE else '.ndjson'}"
+            )
         
-        # Create temporary NDJSON file for intermediate storage
-        temp_dir = tempfile.mkdtemp()
-        temp_ndjson = os.path.join(temp_dir, f"crawl_{int(time.time())}.ndjson")
+        # Columns seen while crawling, so conversion needs a single pass
+        basic_cols: Set[str] = set()
+        attr_cols: Set[str] = set()
         
         try:
             result = self._crawl_windows_to_temp(
@@ -102,13 +248,18 @@ class CrawlingService:
                 window_days=window_days,
                 max_windows_per_call=max_windows_per_call,
                 max_runtime_sec=max_runtime_sec,
-                delay_sec=delay_sec,
                 temp_ndjson=temp_ndjson,
-                start_time=start_time
+                start_time=start_time,
+                progress_cb=progress_cb,
+                checkpoint_path=checkpoint_path,
+                resume=resume,
+                basic_cols=basic_cols,
+                attr_cols=attr_cols,
+                list_bucket=list_bucket
             )
             
             if not result["success"]:
-                return result
+                return ServiceResult.fail(result.get("error"), result)
             
             # Convert temp NDJSON to CSV
             csv_result = self._convert_temp_to_csv(
@@ -118,11 +269,20 @@ class CrawlingService:
                 explode_attributes=explode_attributes,
                 sanitize=sanitize,
                 append=append,
-                fail_on_new_columns=fail_on_new_columns
+                fail_on_new_columns=fail_on_new_columns,
+                basic_cols=basic_cols,
+                attr_cols=attr_cols,
+                csv_engine=csv_engine
             )
             
             if not csv_result["success"]:
-                return csv_result
+                return ServiceResult.fail(csv_result["error"], csv_result)
+            
+            # Rows are in the CSV now; a stale checkpoint would duplicate them
+            try:
+                os.remove(checkpoint_path)
+            except OSError:
+                pass
             
             # Combine results
             result.update(csv_result)
@@ -132,7 +292,6 @@ class CrawlingService:
             if not keep_temp:
                 try:
                     os.remove(temp_ndjson)
-                    os.rmdir(temp_dir)
                     result["temp_deleted"] = True
                 except OSError:
                     result["temp_deleted"] = False
@@ -140,15 +299,13 @@ class CrawlingService:
                 result["temp_file"] = temp_ndjson
                 result["temp_deleted"] = False
             
-            return result
+            return ServiceResult.ok(result)
             
         except Exception as e:
-            return {
-                "success": False,
-                "error": f"Crawling failed: {str(e)}",
+            return ServiceResult.fail(f"Crawling failed: {str(e)}", {
                 "output_csv": output_csv,
                 "elapsed_sec": calculate_elapsed_time(start_time)
-            }
+            })
     
     def _crawl_windows_to_temp(
         self,
@@ -158,11 +315,33 @@ class CrawlingService:
         window_days: int,
         max_windows_per_call: int,
         max_runtime_sec: int,
-        delay_sec: float,
         temp_ndjson: str,
-        start_time: float
+        start_time: float,
+        progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None,
+        checkpoint_path: Optional[str] = None,
+        resume: Optional[Dict[str, Any]] = None,
+        basic_cols: Optional[Set[str]] = None,
+        attr_cols: Optional[Set[str]] = None,
+        list_bucket: Optional[TokenBucket] = None
     ) -> Dict[str, Any]:
-        """Crawl data in windows and save to temporary NDJSON file."""
+        """Crawl data in windows and save to temporary NDJSON file.
+        
+        Up to ``WINDOW_CONCURRENCY`` windows are crawled at once, each into
+        its own part file; parts are appended to the temp file in window
+        order as they finish.
+        
+        With ``checkpoint_path`` set, one JSON line per finished window is
+        appended and fsync'd. ``resume`` is the last such entry; crawling
+        continues after it, with the temp file truncated to its offset.
+        
+        ``basic_cols``/``attr_cols`` are updated in place with every column
+        written to the temp file. ``list_bucket`` paces the list API calls
+        of this crawl; None leaves them unpaced.
+        """
+        if basic_cols is None:
+            basic_cols = set()
+        if attr_cols is None:
+            attr_cols = set()
         
         current_end = end_date
         windows_processed = 0
@@ -170,35 +349,139 @@ class CrawlingService:
         total_products = 0
         success_details = 0
         failed_details = 0
+        temp_mode = 'w'
         
-        with open(temp_ndjson, 'w', encoding='utf-8') as temp_f:
-            while current_end > start_date:
-                # Check runtime limit
-                if time.time() - start_time > max_runtime_sec:
-                    break
-                
-                # Check window limit
-                if max_windows_per_call > 0 and windows_processed >= max_windows_per_call:
-                    break
-                
-                current_start = max(current_end - timedelta(days=window_days - 1), start_date)
-                
-                window_result = self._crawl_window(
-                    category=category,
-                    window_start=current_start,
-                    window_end=current_end,
-                    temp_f=temp_f,
-                    delay_sec=delay_sec
-                )
-                
-                windows_processed += 1
-                pages_processed += window_result["pages"]
-                total_products += window_result["products"]
-                success_details += window_result["success_details"]
-                failed_details += window_result["failed_details"]
-                
-                # Move to next window
-                current_end = current_start - timedelta(days=1)
+        if resume is not None:
+            current_end = datetime.fromisoformat(resume["next_end"])
+            windows_processed = resume["windows_processed"]
+            pages_processed = resume["pages_processed"]
+            total_products = resume["total_products"]
+            success_details = resume["success_details"]
+            failed_details = resume["failed_details"]
+            # Drop anything written after the last checkpointed window
+            with open(temp_ndjson, 'r+b') as f:
+                f.truncate(resume["temp_offset"])
+            temp_mode = 'a'
+            # Columns from the earlier run are only recorded in the temp file
+            resumed_basic, resumed_attr = self._scan_temp_columns(temp_ndjson)
+            basic_cols.update(resumed_basic)
+            attr_cols.update(resumed_attr)
+        
+        # Windows run newest first; each is self-contained, so up to
+        # WINDOW_CONCURRENCY of them are crawled at once into part files
+        windows: List[Tuple[datetime, datetime]] = []
+        window_end = current_end
+        while window_end > start_date:
+            if max_windows_per_call > 0 and len(windows) >= max_windows_per_call:
+                break
+            window_start = max(window_end - timedelta(days=window_days - 1), start_date)
+            windows.append((window_start, window_end))
+            window_end = window_start - timedelta(days=1)
+        
+        ckpt_f = None
+        if checkpoint_path:
+            # Rewritten rather than appended so a torn last line can't merge
+            # with the next entry
+            ckpt_f = open(checkpoint_path, 'w', encoding='utf-8')
+            if resume is not None:
+                self._write_checkpoint(ckpt_f, resume)
+        
+        # Parts left behind by a crashed run are never referenced again
+        for stale_part in glob.glob(f"{glob.escape(temp_ndjson)}.part*"):
+            os.remove(stale_part)
+        
+        # Each part is one complete zstd frame; concatenated frames stay a
+        # valid stream, and checkpoint offsets always fall between them
+        compress = temp_ndjson.endswith('.zst')
+        window_pool = ThreadPoolExecutor(
+            max_workers=WINDOW_CONCURRENCY,
+            thread_name_prefix="window"
+        )
+        in_flight: Deque[Tuple[datetime, datetime, str, Future]] = deque()
+        next_window = iter(enumerate(windows, start=windows_processed))
+        
+        def submit_next() -> bool:
+            # Like the serial loop, the runtime limit only stops new windows
+            if time.time() - start_time > max_runtime_sec:
+                return False
+            nxt = next(next_window, None)
+            if nxt is None:
+                return False
+            index, (window_start, window_end) = nxt
+            part_path = f"{temp_ndjson}.part{index}"
+            in_flight.append((window_start, window_end, part_path, window_pool.submit(
+                self._crawl_window_to_part,
+                category, window_start, window_end, part_path, compress, list_bucket
+            )))
+            return True
+        
+        try:
+            while len(in_flight) < WINDOW_CONCURRENCY and submit_next():
+                pass
+            
+            with open(temp_ndjson, temp_mode + 'b', buffering=_TEMP_BUFFER_SIZE) as temp_f:
+                # Results are merged in window order so the temp file and the
+                # checkpoint always cover a contiguous run of windows
+                while in_flight:
+                    # Dequeued only once merged, so a failed window's part
+                    # is still cleaned up below
+                    current_start, window_end, part_path, future = in_flight[0]
+                    window_result, window_basic, window_attr = future.result()
+                    
+                    with open(part_path, 'rb') as part_f:
+                        shutil.copyfileobj(part_f, temp_f, _TEMP_FLUSH_BYTES)
+                    os.remove(part_path)
+                    in_flight.popleft()
+                    basic_cols.update(window_basic)
+                    attr_cols.update(window_attr)
+                    
+                    windows_processed += 1
+                    pages_processed += window_result["pages"]
+                    total_products += window_result["products"]
+                    success_details += window_result["success_details"]
+                    failed_details += window_result["failed_details"]
+                    
+                    if progress_cb is not None:
+                        progress_cb({
+                            "window": windows_processed,
+                            "window_start": current_start.strftime(DATE_FMT),
+                            "window_end": window_end.strftime(DATE_FMT),
+                            "pages_processed": pages_processed,
+                            "total_products": total_products,
+                            "success_details": success_details,
+                            "failed_details": failed_details,
+                            "elapsed_sec": calculate_elapsed_time(start_time)
+                        })
+                    
+                    # Move to next window
+                    current_end = current_start - timedelta(days=1)
+                    
+                    if ckpt_f is not None:
+                        # An entry must never point past data that is in the temp file
+                        temp_f.flush()
+                        self._write_checkpoint(ckpt_f, {
+                            "category": category,
+                            "end_date": end_date.isoformat(),
+                            "next_end": current_end.isoformat(),
+                            "temp_ndjson": temp_ndjson,
+                            "temp_offset": os.fstat(temp_f.fileno()).st_size,
+                            "windows_processed": windows_processed,
+                            "pages_processed": pages_processed,
+                            "total_products": total_products,
+                            "success_details": success_details,
+                            "failed_details": failed_details
+                        })
+                    
+                    submit_next()
+        finally:
+            window_pool.shutdown(wait=True, cancel_futures=True)
+            for _, _, part_path, _ in in_flight:
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+            if ckpt_f is not None:
+                ckpt_f.close()
         
         # Calculate completion status
         covered_days = (end_date - current_end).days if current_end < end_date else 0
@@ -223,15 +506,151 @@ class CrawlingService:
             "covered_days": covered_days
         }
     
+    def _write_checkpoint(self, ckpt_f, entry: Dict[str, Any]) -> None:
+        """Append one checkpoint entry and force it to disk."""
+        ckpt_f.write(json.dumps(entry) + "\n")
+        ckpt_f.flush()
+        os.fsync(ckpt_f.fileno())
+    
+    def _load_checkpoint(
+        self,
+        checkpoint_path: str,
+        category: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return the last checkpoint entry if the crawl can resume from it."""
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        
+        entry = None
+        for line in reversed(lines):
+            try:
+                entry = json.loads(line)
+                break
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a torn final line
+                continue
+        
+        if not entry or entry.get("category") != category:
+            return None
+        
+        temp_ndjson = entry.get("temp_ndjson")
+        if not temp_ndjson or not os.path.exists(temp_ndjson):
+            return None
+        if os.path.getsize(temp_ndjson) < entry.get("temp_offset", 0):
+            return None
+        
+        return entry
+    
+    def _fetch_detail(self, item: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Fetch detail attributes for one list item; returns (attributes, ok)."""
+        try:
+            payload = extract_g2b_params(item)
+            self._detail_bucket.acquire()
+            detail_response = self.client.call_detail_api(payload)
+            
+            attributes = {}
+            result_list = detail_response.get("resultList", [])
+            
+            if isinstance(result_list, list):
+                for attr_item in result_list:
+                    if isinstance(attr_item, dict):
+                        attr_name = attr_item.get("prdctAtrbNm", "")
+                        attr_value = attr_item.get("prdctAtrbVl", "")
+                        if attr_name and attr_value:
+                            attributes[attr_name] = attr_value
+            
+            return attributes, True
+        except Exception:
+            # A malformed response fails this item only, never the page
+            return {}, False
+    
+    def _scan_temp_columns(self, temp_ndjson: str) -> Tuple[Set[str], Set[str]]:
+        """Collect basic and attribute column names from a temp NDJSON file."""
+        all_basic_cols: Set[str] = set()
+        all_attr_cols: Set[str] = set()
+        
+        with self._open_temp_reader(temp_ndjson) as temp_f:
+            for line in temp_f:
+                if line.strip():
+                    try:
+                        record = orjson.loads(line)
+                        
+                        # Basic columns (excluding attributes)
+                        for key in record.keys():
+                            if key != "attributes":
+                                all_basic_cols.add(key)
+                        
+                        # Attribute columns
+                        attributes = record.get("attributes", {})
+                        if isinstance(attributes, dict):
+                            all_attr_cols.update(attributes.keys())
+                    
+                    except orjson.JSONDecodeError:
+                        continue
+        
+        return all_basic_cols, all_attr_cols
+    
+    def _crawl_window_to_part(
+        self,
+        category: str,
+        window_start: datetime,
+        window_end: datetime,
+        part_path: str,
+        compress: bool = False,
+        list_bucket: Optional[TokenBucket] = None
+    ) -> Tuple[Dict[str, Any], Set[str], Set[str]]:
+        """Crawl one window into its own part file, zstd-compressed if asked.
+        
+        Returns the window result with the basic and attribute columns it wrote.
+        """
+        basic_cols: Set[str] = set()
+        attr_cols: Set[str] = set()
+        with open(part_path, 'wb') as part_f:
+            if compress:
+                part_f = zstandard.ZstdCompressor(level=1).stream_writer(part_f)
+            try:
+                window_result = self._crawl_window(
+                    category=category,
+                    window_start=window_start,
+                    window_end=window_end,
+                    temp_f=part_f,
+                    basic_cols=basic_cols,
+                    attr_cols=attr_cols,
+                    list_bucket=list_bucket
+                )
+            finally:
+                # Closing the stream writer ends the frame
+                part_f.close()
+        return window_result, basic_cols, attr_cols
+    
+    @staticmethod
+    @contextmanager
+    def _open_temp_reader(temp_ndjson: str) -> Iterator[io.BufferedIOBase]:
+        """Open a temp NDJSON file for reading lines, decompressing ``.zst``."""
+        with open(temp_ndjson, 'rb') as raw_f:
+            if not temp_ndjson.endswith('.zst'):
+                yield raw_f
+                return
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                raw_f, read_across_frames=True
+            )
+            with io.BufferedReader(reader, buffer_size=_TEMP_FLUSH_BYTES) as temp_f:
+                yield temp_f
+    
     def _crawl_window(
         self,
         category: str,
         window_start: datetime,
         window_end: datetime,
         temp_f,
-        delay_sec: float
+        basic_cols: Set[str],
+        attr_cols: Set[str],
+        list_bucket: Optional[TokenBucket] = None
     ) -> Dict[str, Any]:
-        """Crawl a single time window."""
+        """Crawl a single time window, recording the columns it writes."""
         
         page = 1
         products = 0
@@ -241,6 +660,7 @@ class CrawlingService:
         
         start_str = window_start.strftime(DATE_FMT)
         end_str = window_end.strftime(DATE_FMT)
+        buf = bytearray()
         
         while page <= DEFAULT_MAX_PAGES:
             try:
@@ -254,6 +674,8 @@ class CrawlingService:
                     "inqryDiv": 1,
                 }
                 
+                if list_bucket is not None:
+                    list_bucket.acquire()
                 data = self.client.call_list_api(params)
                 body = data.get("response", {}).get("body", {})
                 items = body.get("items", [])
@@ -272,58 +694,40 @@ class CrawlingService:
                 pages += 1
                 products += len(items)
                 
-                # Process each item for detailed attributes
-                for item in items:
-                    try:
-                        # Get detailed attributes
-                        payload = extract_g2b_params(item)
-                        detail_response = self.client.call_detail_api(payload)
-                        
-                        attributes = {}
-                        result_list = detail_response.get("resultList", [])
-                        
-                        if isinstance(result_list, list):
-                            for attr_item in result_list:
-                                if isinstance(attr_item, dict):
-                                    attr_name = attr_item.get("prdctAtrbNm", "")
-                                    attr_value = attr_item.get("prdctAtrbVl", "")
-                                    if attr_name and attr_value:
-                                        attributes[attr_name] = attr_value
-                        
-                        # Create record
-                        record = {
-                            **item,
-                            "attributes": attributes,
-                            "window_start": start_str,
-                            "window_end": end_str,
-                            "detail_success": True
-                        }
-                        
+                # Fetch detail attributes concurrently; map() keeps page order
+                for item, (attributes, ok) in zip(
+                    items, self._detail_pool.map(self._fetch_detail, items)
+                ):
+                    record = {
+                        **item,
+                        "attributes": attributes,
+                        "window_start": start_str,
+                        "window_end": end_str,
+                        "detail_success": ok
+                    }
+                    if ok:
                         success_details += 1
-                        
-                    except Exception:
-                        # Create record without attributes
-                        record = {
-                            **item,
-                            "attributes": {},
-                            "window_start": start_str,
-                            "window_end": end_str,
-                            "detail_success": False
-                        }
+                    else:
                         failed_details += 1
+                    basic_cols.update(record)
+                    attr_cols.update(attributes)
                     
-                    # Write to temp file
-                    temp_f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    buf += orjson.dumps(record)
+                    buf += b'\n'
                 
-                page += 1
+                if len(buf) >= _TEMP_FLUSH_BYTES:
+                    temp_f.write(buf)
+                    buf.clear()
                 
-                # Add delay between requests
-                if delay_sec > 0:
-                    time.sleep(delay_sec)
+                page += 1
                 
             except Exception:
                 break
         
+        # The window's tail must reach the file before it is checkpointed
+        if buf:
+            temp_f.write(buf)
+        
         return {
             "pages": pages,
             "products": products,
@@ -331,6 +735,72 @@ class CrawlingService:
             "failed_details": failed_details
         }
     
+    def _write_csv_rows_arrow(
+        self,
+        temp_ndjson: str,
+        csv_f,
+        header: List[str],
+        sources: List[Tuple[str, Optional[str]]],
+        record_keys: Set[str],
+        attr_keys: Set[str]
+    ) -> int:
+        """Write CSV data rows with Arrow's streaming JSON reader and CSV writer.
+        
+        Every record value must be text (``detail_success`` a bool);
+        anything else raises ``pa.ArrowInvalid`` before rows are trusted,
+        so callers can fall back to the Python path.
+        """
+        schema = pa.schema(
+            [(key, pa.bool_() if key == "detail_success" else pa.string())
+             for key in sorted(record_keys)]
+            + [("attributes", pa.struct([(key, pa.string()) for key in sorted(attr_keys)]))]
+        )
+        reader = pa_json.open_json(
+            pa.input_stream(
+                temp_ndjson,
+                compression="zstd" if temp_ndjson.endswith('.zst') else None
+            ),
+            read_options=pa_json.ReadOptions(block_size=32 << 20),
+            parse_options=pa_json.ParseOptions(
+                explicit_schema=schema,
+                unexpected_field_behavior="ignore"
+            )
+        )
+        
+        rows = 0
+        writer = None
+        try:
+            for batch in reader:
+                attributes = batch.column("attributes")
+                missing = pa.nulls(batch.num_rows, pa.string())
+                columns = []
+                for kind, key in sources:
+                    if kind == "record" and key in record_keys:
+                        columns.append(batch.column(key))
+                    elif kind == "attribute" and key in attr_keys:
+                        columns.append(pc.struct_field(attributes, key))
+                    elif kind == "flag" and key in record_keys:
+                        flags = pc.fill_null(batch.column(key), False)
+                        columns.append(pc.if_else(flags, "1", "0"))
+                    elif kind == "flag":
+                        columns.append(pa.repeat("0", batch.num_rows))
+                    else:
+                        columns.append(missing)
+                
+                out = pa.record_batch(columns, names=header)
+                if writer is None:
+                    writer = pa_csv.CSVWriter(
+                        csv_f,
+                        out.schema,
+                        write_options=pa_csv.WriteOptions(include_header=False, eol="\r\n")
+                    )
+                writer.write_batch(out)
+                rows += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+    
     def _convert_temp_to_csv(
         self,
         temp_ndjson: str,
@@ -339,40 +809,37 @@ class CrawlingService:
         explode_attributes: bool,
         sanitize: bool,
         append: bool,
-        fail_on_new_columns: bool
+        fail_on_new_columns: bool,
+        basic_cols: Optional[Set[str]] = None,
+        attr_cols: Optional[Set[str]] = None,
+        csv_engine: str = "python"
     ) -> Dict[str, Any]:
-        """Convert temporary NDJSON file to CSV format."""
+        """Convert temporary NDJSON file to CSV format.
+        
+        Pass the column sets collected while crawling to skip the discovery
+        pass over the temp file. See ``crawl_to_csv`` for ``csv_engine``.
+        """
         
         try:
-            # First pass: determine all columns
-            all_basic_cols = set()
-            all_attr_cols = set()
-            
-            with open(temp_ndjson, 'r', encoding='utf-8') as temp_f:
-                for line in temp_f:
-                    if line.strip():
-                        try:
-                            record = json.loads(line)
-                            
-                            # Basic columns (excluding attributes)
-                            for key in record.keys():
-                                if key != "attributes":
-                                    all_basic_cols.add(key)
-                            
-                            # Attribute columns
-                            attributes = record.get("attributes", {})
-                            if isinstance(attributes, dict):
-                                all_attr_cols.update(attributes.keys())
-                        
-                        except json.JSONDecodeError:
-                            continue
+            if basic_cols is None or attr_cols is None:
+                all_basic_cols, all_attr_cols = self._scan_temp_columns(temp_ndjson)
+            else:
+                all_basic_cols = basic_cols - {"attributes"}
+                all_attr_cols = attr_cols
             
             # Sort columns for consistency
             basic_cols_sorted = sorted(all_basic_cols)
             attr_cols_sorted = sorted(all_attr_cols)
             
-            # Sanitize column names if requested
+            # Sanitize column names if requested, remembering each sanitized
+            # name's original key so rows need a single dict lookup per column
+            sanitize_map: Dict[str, str] = {}
+            attr_sanitize_map: Dict[str, str] = {}
             if sanitize:
+                for orig_col in basic_cols_sorted:
+                    sanitize_map.setdefault(sanitize_column_name(orig_col), orig_col)
+                for orig_col in attr_cols_sorted:
+                    attr_sanitize_map.setdefault(sanitize_column_name(orig_col), orig_col)
                 basic_cols_sorted = [sanitize_column_name(c) for c in basic_cols_sorted]
                 attr_cols_sorted = [sanitize_column_name(c) for c in attr_cols_sorted]
             
@@ -395,65 +862,76 @@ class CrawlingService:
                         "new_columns": list(new_cols)
                     }
                 
-                if new_cols:
-                    # Use existing header and ignore new columns
-                    header = existing_header
+                # Rows must follow the header already on disk: new columns are
+                # dropped, and its order and any columns this crawl lacks win
+                header = existing_header
             
-            # Second pass: write CSV
+            # Resolve one (kind, key) source per header column up front.
+            # Later entries override earlier ones for the same name:
+            # attributes over basic columns, and the metadata columns over
+            # everything. Columns outside the header never get one.
+            header_set = set(header)
+            col_sources: Dict[str, Tuple[str, Optional[str]]] = {}
+            for col in basic_cols_sorted:
+                if col in header_set:
+                    col_sources[col] = ("record", sanitize_map.get(col, col))
+            if explode_attributes:
+                for attr_col in attr_cols_sorted:
+                    col_name = f"attr_{attr_col}"
+                    if col_name in header_set:
+                        col_sources[col_name] = (
+                            "attribute", attr_sanitize_map.get(attr_col, attr_col)
+                        )
+            else:
+                # Failed or empty detail lookups leave the cell blank, not "{}"
+                col_sources["attributes_json"] = ("attributes_json", None)
+            col_sources["window_start"] = ("record", "window_start")
+            col_sources["window_end"] = ("record", "window_end")
+            col_sources["detail_success"] = ("flag", "detail_success")
+            sources = [col_sources.get(col, ("missing", None)) for col in header]
+            
+            # Write CSV
             file_mode = "a" if (append and existing_header is not None) else "w"
-            rows_written = 0
+            rows_written = None
             
-            with open(output_csv, file_mode, newline="", encoding="utf-8-sig") as csv_f:
-                writer = csv.writer(csv_f)
-                
-                # Write header only for new files
+            encoder = _CsvRowEncoder()
+            with open(output_csv, file_mode + "b", buffering=_TEMP_FLUSH_BYTES) as csv_f:
+                # Write BOM and header only for new files
                 if file_mode == "w":
-                    writer.writerow(header)
+                    csv_f.write(codecs.BOM_UTF8)
+                    csv_f.write(encoder.encode_row(header))
                 
-                # Write data rows
-                with open(temp_ndjson, 'r', encoding='utf-8') as temp_f:
-                    for line in temp_f:
-                        if line.strip():
-                            try:
-                                record = json.loads(line)
-                                
-                                # Build row data
-                                row_data = {}
-                                
-                                # Basic columns
-                                for col in basic_cols_sorted:
-                                    original_col = col
-                                    if sanitize:
-                                        # Find original column name
-                                        for orig_key in record.keys():
-                                            if sanitize_column_name(orig_key) == col:
-                                                original_col = orig_key
-                                                break
-                                    row_data[col] = record.get(original_col, "")
-                                
-                                # Attribute columns
+                if csv_engine == "pyarrow" and explode_attributes:
+                    data_start = csv_f.tell()
+                    try:
+                        rows_written = self._write_csv_rows_arrow(
+                            temp_ndjson, csv_f, header, sources,
+                            all_basic_cols, all_attr_cols
+                        )
+                    except pa.ArrowException:
+                        # Values Arrow can't type as text; redo in Python
+                        csv_f.truncate(data_start)
+                        csv_f.seek(data_start)
+                
+                used_engine = "pyarrow"
+                if rows_written is None:
+                    used_engine = "python"
+                    rows_written = 0
+                    build_row = _compile_row_builder(tuple(
+                        _ROW_EXPRS[kind].format(key=key) for kind, key in sources
+                    ))
+                    
+                    # Write data rows in header order
+                    with self._open_temp_reader(temp_ndjson) as temp_f:
+                        for line in temp_f:
+                            if line.strip():
+                                try:
+                                    record = orjson.loads(line)
+                                except orjson.JSONDecodeError:
+                                    continue
                                 attributes = record.get("attributes", {})
-                                if explode_attributes:
-                                    for attr_col in attr_cols_sorted:
-                                        col_name = f"attr_{attr_col}"
-                                        if sanitize:
-                                            col_name = f"attr_{sanitize_column_name(attr_col)}"
-                                        row_data[col_name] = attributes.get(attr_col, "")
-                                else:
-                                    row_data["attributes_json"] = json.dumps(attributes, ensure_ascii=False)
-                                
-                                # Additional metadata
-                                row_data["window_start"] = record.get("window_start", "")
-                                row_data["window_end"] = record.get("window_end", "")
-                                row_data["detail_success"] = "1" if record.get("detail_success") else "0"
-                                
-                                # Write row in header order
-                                row = [row_data.get(col, "") for col in header]
-                                writer.writerow(row)
+                                csv_f.write(encoder.encode_row(build_row(record, attributes)))
                                 rows_written += 1
-                                
-                            except json.JSONDecodeError:
-                                continue
             
             return {
                 "success": True,
@@ -464,7 +942,8 @@ class CrawlingService:
                 "explode_attributes": explode_attributes,
                 "sanitize": sanitize,
                 "append_mode": append,
-                "existing_header_used": existing_header is not None
+                "existing_header_used": existing_header is not None,
+                "csv_engine": used_engine
             }
             
         except Exception as e:
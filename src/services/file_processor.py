@@ -1,22 +1,22 @@
 """File processing service for data conversion and management."""
 
 import csv
+import fnmatch
 import glob
 import json
 import os
+import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
 
 from ..core.config import OUTPUT_DIR
-from ..core.models import (
-    ConvertResult,
-    FileInfo, 
-    MergeResult,
-    SaveResultsResponse,
-    SummaryResult
-)
+from ..core.models import FileInfo, ServiceResult
 from ..core.utils import ensure_dir, format_file_size
 
 
@@ -31,8 +31,8 @@ class FileProcessorService:
         products: List[Dict[str, Any]], 
         filename: str,
         directory: str = OUTPUT_DIR
-    ) -> SaveResultsResponse:
-        """Save products list to JSON file."""
+    ) -> ServiceResult:
+        """Save products list to JSON file; data is a SaveResultsResponse."""
         ensure_dir(directory)
         
         if not filename.endswith('.json'):
@@ -44,182 +44,269 @@ class FileProcessorService:
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(products, f, ensure_ascii=False, indent=2)
             
-            return {
+            return ServiceResult.ok({
                 "success": True,
                 "filename": filename,
                 "products_count": len(products)
-            }
+            })
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
+            return ServiceResult.fail(str(e), {
                 "filename": filename
-            }
+            })
     
     def convert_json_to_parquet(
         self,
         json_path: str,
         output_parquet: Optional[str] = None,
         explode_attributes: bool = False
-    ) -> ConvertResult:
-        """Convert JSON file to Parquet format."""
+    ) -> ServiceResult:
+        """Convert JSON file to Parquet format; data is a ConvertResult."""
         
         if not output_parquet:
             base = os.path.splitext(json_path)[0]
             output_parquet = f"{base}.parquet"
         
         try:
-            # Load JSON data
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                return {
-                    "success": False,
-                    "error": "JSON file must contain a list of objects",
-                    "input_file": json_path
-                }
-            
-            if not data:
-                return {
-                    "success": False,
-                    "error": "JSON file is empty",
-                    "input_file": json_path
-                }
+            if self._is_line_delimited(json_path):
+                table = pa_json.read_json(
+                    json_path,
+                    read_options=pa_json.ReadOptions(block_size=64 << 20)
+                )
+            else:
+                with open(json_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+                
+                if not isinstance(data, list):
+                    return ServiceResult.fail("JSON file must contain a list of objects", {
+                        "input_file": json_path
+                    })
+                
+                if not data:
+                    return ServiceResult.fail("JSON file is empty", {
+                        "input_file": json_path
+                    })
+                
+                # pa.array infers the struct type over every record, unlike
+                # Table.from_pylist which only looks at the first one
+                table = pa.Table.from_struct_array(pa.array(data))
+                del data
             
-            # Convert to DataFrame
-            df = pd.json_normalize(data)
+            # Flatten nested structs into dotted columns (as json_normalize did)
+            while any(pa.types.is_struct(field.type) for field in table.schema):
+                table = table.flatten()
             
-            # Handle attributes column if it exists
-            if explode_attributes and 'attributes' in df.columns:
-                # Explode attributes into separate columns
-                attributes_df = pd.json_normalize(df['attributes'].fillna({}))
-                attributes_df.columns = [f"attr_{col}" for col in attributes_df.columns]
-                
-                # Combine with original DataFrame (excluding attributes column)
-                df_without_attrs = df.drop(columns=['attributes'])
-                df = pd.concat([df_without_attrs, attributes_df], axis=1)
+            if explode_attributes:
+                table = table.rename_columns([
+                    f"attr_{name[len('attributes.'):]}" if name.startswith('attributes.') else name
+                    for name in table.column_names
+                ])
             
-            # Save to Parquet
-            df.to_parquet(output_parquet, index=False)
+            # Write in batches so the writer never buffers the whole table
+            with pq.ParquetWriter(output_parquet, table.schema, compression='zstd') as writer:
+                for batch in table.to_batches(max_chunksize=65536):
+                    writer.write_batch(batch)
             
-            return {
+            return ServiceResult.ok({
                 "success": True,
                 "input_file": json_path,
                 "output_file": output_parquet,
-                "rows_converted": len(df)
-            }
+                "rows_converted": table.num_rows
+            })
             
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
+            return ServiceResult.fail(str(e), {
                 "input_file": json_path,
                 "output_file": output_parquet or "N/A"
-            }
+            })
+    
+    @staticmethod
+    def _is_line_delimited(json_path: str) -> bool:
+        """Check for NDJSON by extension or by two leading lines that are objects.
+        
+        A single object on one line is plain JSON (and rejected as not a list).
+        """
+        if json_path.endswith(('.ndjson', '.jsonl')):
+            return True
+        objects = 0
+        with open(json_path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if not line.startswith(b'{'):
+                    return False
+                try:
+                    if not isinstance(orjson.loads(line), dict):
+                        return False
+                except orjson.JSONDecodeError:
+                    return False
+                objects += 1
+                if objects == 2:
+                    return True
+        return False
     
     def merge_csv_files(
         self,
         input_pattern: str,
         output_csv: str
-    ) -> MergeResult:
-        """Merge multiple CSV files matching pattern into single file."""
+    ) -> ServiceResult:
+        """Merge CSV files matching pattern into a single file; data is a MergeResult."""
         
         try:
             input_files = glob.glob(input_pattern)
             
             if not input_files:
-                return {
-                    "success": False,
-                    "error": f"No files found matching pattern: {input_pattern}",
+                return ServiceResult.fail(f"No files found matching pattern: {input_pattern}", {
                     "input_files": []
-                }
+                })
             
             input_files.sort()  # Sort for consistent ordering
             
-            all_dataframes = []
-            total_rows = 0
-            
+            # Read headers first so the output header is the union of all
+            # inputs (in order of first appearance) before any row is written
+            output_abspath = os.path.abspath(output_csv)
+            headers = []
             for file_path in input_files:
+                if os.path.abspath(file_path) == output_abspath:
+                    continue
                 try:
-                    df = pd.read_csv(file_path)
-                    all_dataframes.append(df)
-                    total_rows += len(df)
-                except Exception as e:
+                    with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+                        header = next(csv.reader(f), None)
+                except (OSError, UnicodeDecodeError, csv.Error):
                     # Skip problematic files but continue
                     continue
+                if header:
+                    headers.append((file_path, header))
             
-            if not all_dataframes:
-                return {
-                    "success": False,
-                    "error": "No valid CSV files found to merge",
+            if not headers:
+                return ServiceResult.fail("No valid CSV files found to merge", {
                     "input_files": input_files
-                }
+                })
             
-            # Concatenate all DataFrames
-            merged_df = pd.concat(all_dataframes, ignore_index=True, sort=False)
+            merged_header = list(dict.fromkeys(
+                col for _, header in headers for col in header
+            ))
             
-            # Save merged file
-            merged_df.to_csv(output_csv, index=False, encoding='utf-8-sig')
+            # Stream rows into the merged file, remapping columns when a
+            # file's header differs from the merged one
+            total_rows = 0
+            with open(output_csv, 'w', newline='', encoding='utf-8-sig') as out_f:
+                writer = csv.writer(out_f)
+                writer.writerow(merged_header)
+                
+                for file_path, header in headers:
+                    with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+                        reader = csv.reader(f)
+                        next(reader, None)
+                        
+                        if header == merged_header:
+                            for row in reader:
+                                if row:
+                                    writer.writerow(row)
+                                    total_rows += 1
+                            continue
+                        
+                        col_pos = {col: i for i, col in enumerate(header)}
+                        positions = [col_pos.get(col) for col in merged_header]
+                        for row in reader:
+                            if not row:
+                                continue
+                            writer.writerow([
+                                row[i] if i is not None and i < len(row) else ""
+                                for i in positions
+                            ])
+                            total_rows += 1
             
-            return {
+            return ServiceResult.ok({
                 "success": True,
                 "input_files": input_files,
                 "output_file": output_csv,
-                "total_rows": len(merged_df)
-            }
+                "total_rows": total_rows
+            })
             
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
+            return ServiceResult.fail(str(e), {
                 "input_files": input_files if 'input_files' in locals() else [],
                 "output_file": output_csv
-            }
+            })
     
     def summarize_csv(
         self,
         csv_path: str,
         max_rows_preview: int = 5
-    ) -> SummaryResult:
-        """Provide summary information about a CSV file."""
+    ) -> ServiceResult:
+        """Provide summary information about a CSV file; data is a SummaryResult."""
+        return self.summarize_csv_fast(csv_path, max_rows_preview)
+    
+    def summarize_csv_fast(
+        self,
+        csv_path: str,
+        max_rows_preview: int = 5,
+        count_rows: bool = True
+    ) -> ServiceResult:
+        """Summarize a CSV without loading it whole; data is a SummaryResult.
+        
+        Only ``max_rows_preview`` rows are parsed for the preview. When
+        ``count_rows`` is set, the row count comes from a byte scan of the
+        file; otherwise ``rows`` is None.
+        """
         
         try:
-            # Get file info
             if not os.path.exists(csv_path):
-                return {
-                    "success": False,
-                    "error": f"File not found: {csv_path}",
+                return ServiceResult.fail(f"File not found: {csv_path}", {
                     "file_path": csv_path
-                }
+                })
             
-            # Read CSV
-            df = pd.read_csv(csv_path, encoding='utf-8-sig')
+            preview_df = pd.read_csv(csv_path, encoding='utf-8-sig', nrows=max_rows_preview)
+            headers = preview_df.columns.tolist()
             
-            # Get headers and basic info
-            headers = df.columns.tolist()
-            rows = len(df)
-            columns = len(headers)
+            rows = None
+            if count_rows:
+                rows = self._count_csv_rows(csv_path) if headers else 0
             
-            # Create preview data
-            preview_df = df.head(max_rows_preview)
-            preview = preview_df.to_dict('records')
-            
-            return {
+            return ServiceResult.ok({
                 "success": True,
                 "file_path": csv_path,
                 "rows": rows,
-                "columns": columns,
+                "columns": len(headers),
                 "headers": headers,
-                "preview": preview
-            }
+                "preview": preview_df.to_dict('records')
+            })
             
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
+            return ServiceResult.fail(str(e), {
                 "file_path": csv_path
-            }
+            })
+    
+    @staticmethod
+    def _count_csv_rows(csv_path: str) -> int:
+        """Count data rows by scanning for newlines outside quoted fields.
+        
+        Blank lines are skipped, as pandas' ``skip_blank_lines`` did.
+        """
+        records = 0
+        in_quotes = False
+        at_line_start = True
+        with open(csv_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                # Even-indexed pieces are outside quotes when the chunk
+                # starts outside them; "" escapes flip the state twice.
+                # Quoted runs become a placeholder byte so their line isn't blank
+                pieces = chunk.split(b'"')
+                text = b'x'.join(pieces[1 if in_quotes else 0::2]).replace(b'\r', b'')
+                # Every newline in a run after the first ends a blank line
+                runs = re.findall(rb'\n{2,}', (b'\n' if at_line_start else b'') + text)
+                records += text.count(b'\n') - sum(len(run) - 1 for run in runs)
+                if len(pieces) % 2 == 0:
+                    in_quotes = not in_quotes
+                if in_quotes:
+                    at_line_start = False
+                elif text:
+                    at_line_start = text.endswith(b'\n')
+        if not at_line_start:
+            records += 1
+        # The header line is not a row
+        return max(records - 1, 0)
     
     def list_files(
         self,
@@ -232,20 +319,39 @@ class FileProcessorService:
         files = []
         
         try:
-            search_pattern = os.path.join(directory, pattern)
-            
-            for filepath in glob.glob(search_pattern):
-                if os.path.isfile(filepath):
-                    stat = os.stat(filepath)
-                    files.append({
-                        "filename": os.path.basename(filepath),
-                        "path": filepath,
-                        "size_bytes": stat.st_size,
-                        "modified_time": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-                    })
+            subdir, name_pattern = os.path.split(pattern)
+            if any(c in subdir for c in "*?["):
+                # Wildcards in the directory part still need glob
+                matches = [
+                    (filepath, os.stat(filepath))
+                    for filepath in glob.glob(os.path.join(directory, pattern))
+                    if os.path.isfile(filepath)
+                ]
+            else:
+                scan_dir = os.path.join(directory, subdir) if subdir else directory
+                if not os.path.isdir(scan_dir):
+                    return []
+                # Like glob, wildcards don't match hidden files unless asked to
+                include_hidden = name_pattern.startswith('.')
+                with os.scandir(scan_dir) as it:
+                    matches = [
+                        (entry.path, entry.stat())
+                        for entry in it
+                        if (include_hidden or not entry.name.startswith('.'))
+                        and fnmatch.fnmatch(entry.name, name_pattern)
+                        and entry.is_file()
+                    ]
             
             # Sort by modification time, newest first
-            files.sort(key=lambda x: x["modified_time"], reverse=True)
+            matches.sort(key=lambda match: match[1].st_mtime, reverse=True)
+            
+            for filepath, stat in matches:
+                files.append({
+                    "filename": os.path.basename(filepath),
+                    "path": filepath,
+                    "size_bytes": stat.st_size,
+                    "modified_time": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                })
             return files
             
         except Exception as e:
@@ -1,38 +1,193 @@
 """OpenAPI-based MCP tools for Naramarket APIs."""
 
+import asyncio
+import hashlib
 import os
-from typing import Any, Dict, Optional
+import urllib.parse
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import orjson
+import yaml
 
 try:
+    import fastmcp
     from fastmcp import FastMCP
 except ImportError:
     raise RuntimeError("fastmcp>=2.0.0 is required for OpenAPI integration")
 
-from ..core.config import get_service_key
+from ..core.config import OPENAPI_BASE_URL, get_service_key
+from ..core.utils import ensure_dir
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+# 파싱된 OpenAPI 스펙 캐시 위치 (파일 해시로 자동 무효화)
+OPENAPI_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "naramarket"
+)
+
+
+def load_openapi_spec(openapi_path: str) -> Dict[str, Any]:
+    """Load the OpenAPI spec, reusing a JSON copy cached by the YAML's hash."""
+    with open(openapi_path, 'rb') as f:
+        raw = f.read()
+    
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    cache_path = os.path.join(OPENAPI_CACHE_DIR, f"openapi-{digest}.json")
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    
+    # Cold and warm starts both return the JSON round-trip of the spec
+    data = orjson.dumps(yaml.load(raw, Loader=_YamlLoader))
+    try:
+        ensure_dir(OPENAPI_CACHE_DIR)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only home just means no cache
+        pass
+    return orjson.loads(data)
+
 
 # OpenAPI 기반 FastMCP 서버 생성
 def create_openapi_mcp() -> FastMCP:
-    """Create FastMCP server from OpenAPI specification."""
-    openapi_path = os.path.join(
+    """Create FastMCP server from OpenAPI specification.
+    
+    Prefers ``openapi.json`` (rendered from the YAML at image build time)
+    unless it is older than ``openapi.yaml``.
+    """
+    spec_base = os.path.join(
         os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-        "openapi.yaml"
+        "openapi"
     )
+    openapi_path = f"{spec_base}.yaml"
+    openapi_json_path = f"{spec_base}.json"
     
-    if not os.path.exists(openapi_path):
+    if os.path.exists(openapi_json_path) and (
+        not os.path.exists(openapi_path)
+        or os.path.getmtime(openapi_json_path) >= os.path.getmtime(openapi_path)
+    ):
+        with open(openapi_json_path, 'rb') as f:
+            spec = orjson.loads(f.read())
+    elif os.path.exists(openapi_path):
+        spec = load_openapi_spec(openapi_path)
+    else:
         raise FileNotFoundError(f"OpenAPI spec not found: {openapi_path}")
     
+    # 2.x의 단일 패스 OpenAPI 파서 사용 (이후 버전은 기본값이라 설정이 없음)
+    experimental = getattr(fastmcp.settings, "experimental", None)
+    if hasattr(experimental, "enable_new_openapi_parser"):
+        experimental.enable_new_openapi_parser = True
+    
     # FastMCP 2.0의 OpenAPI 자동 생성 기능 사용
-    mcp = FastMCP.from_openapi(openapi_path)
+    mcp = FastMCP.from_openapi(spec)
     
     return mcp
 
 
+# 엔드포인트 URL (호출마다 다시 만들지 않도록 미리 계산)
+_BID_ANNOUNCEMENT_URL = f"{OPENAPI_BASE_URL}/ao/PubDataOpnStdService/getDataSetOpnStdBidPblancInfo"
+_SUCCESSFUL_BID_URL = f"{OPENAPI_BASE_URL}/ao/PubDataOpnStdService/getDataSetOpnStdScsbidInfo"
+_CONTRACT_URL = f"{OPENAPI_BASE_URL}/ao/PubDataOpnStdService/getDataSetOpnStdCntrctInfo"
+_TOTAL_PROCUREMENT_URL = f"{OPENAPI_BASE_URL}/at/PubPrcrmntStatInfoService/getTotlPubPrcrmntSttus"
+_MAS_CONTRACT_PRODUCT_URL = f"{OPENAPI_BASE_URL}/at/ShoppingMallPrdctInfoService/getMASCntrctPrdctInfoList"
+
+
+# 도구 호출용 HTTP 연결 풀 크기
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# 선택 파라미터의 API 이름 (각 메서드의 인자 순서와 동일)
+_BID_ANNOUNCEMENT_OPTIONAL_KEYS = ("bidNtceBgnDt", "bidNtceEndDt")
+_SUCCESSFUL_BID_OPTIONAL_KEYS = ("opengBgnDt", "opengEndDt")
+_CONTRACT_OPTIONAL_KEYS = ("cntrctCnclsBgnDate", "cntrctCnclsEndDate", "insttDivCd", "insttCd")
+_MAS_CONTRACT_PRODUCT_OPTIONAL_KEYS = (
+    "rgstDtBgnDt", "rgstDtEndDt", "prdctClsfcNoNm", "prdctIdntNo",
+    "cntrctCorpNm", "chgDtBgnDt", "chgDtEndDt", "prodctCertYn"
+)
+
+
+@lru_cache(maxsize=1024)
+def _encode_query(items: Tuple[Tuple[str, Any], ...]) -> str:
+    """URL-encode query items; repeated identical queries (paging) hit the cache."""
+    return urllib.parse.urlencode(items, doseq=True)
+
+
+def _request_url(endpoint: str, params: Dict[str, Any]) -> str:
+    """Build the full GET URL for ``params``."""
+    return f"{endpoint}?{_encode_query(tuple(params.items()))}"
+
+
+def _add_optional_params(params: Dict[str, Any], keys: Tuple[str, ...], values: Tuple[Any, ...]) -> None:
+    """Add each truthy optional value under its API parameter name."""
+    # Plain browse calls pass no filters at all; skip the per-key checks
+    if not any(values):
+        return
+    for key, value in zip(keys, values):
+        if value:
+            params[key] = value
+
+
 class OpenAPITools:
     """Enhanced tools for OpenAPI-based Naramarket operations."""
     
+    __slots__ = ("service_key", "base_url", "_params_template", "_client")
+    
     def __init__(self):
         self.service_key = get_service_key()
-        self.base_url = "http://apis.data.go.kr/1230000"
+        self.base_url = OPENAPI_BASE_URL
+        # Parameters shared by every call; copied, never mutated
+        self._params_template = {"ServiceKey": self.service_key, "type": "json"}
+        self._client: Optional[httpx.Client] = None
+    
+    def _get_client(self) -> httpx.Client:
+        """Get or create the pooled keep-alive HTTP client."""
+        if self._client is None:
+            self._client = httpx.Client(timeout=30.0, limits=_HTTP_LIMITS)
+        return self._client
+    
+    def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request built by one of the ``get_*`` methods and return its JSON."""
+        response = self._get_client().request(request["method"], request["url"])
+        response.raise_for_status()
+        return response.json()
+    
+    async def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several ``get_*`` request descriptors concurrently.
+        
+        Results keep the order of ``requests``; a call that fails yields
+        ``{"success": False, "error": ...}`` instead of failing the batch.
+        """
+        async def fetch(client: httpx.AsyncClient, request: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                response = await client.request(request["method"], request["url"])
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPStatusError as e:
+                # str(e) would echo the URL, service key included
+                return {"success": False, "error": f"HTTP {e.response.status_code}"}
+            except (httpx.HTTPError, ValueError) as e:
+                return {"success": False, "error": str(e)}
+        
+        async with httpx.AsyncClient(timeout=30.0, limits=_HTTP_LIMITS) as client:
+            return list(await asyncio.gather(*(fetch(client, r) for r in requests)))
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client, if one was opened."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
     
     def get_bid_announcement_info(
         self,
@@ -42,24 +197,24 @@ class OpenAPITools:
         bid_notice_end_date: Optional[str] = None
     ) -> Dict[str, Any]:
         """입찰공고정보 조회 (getDataSetOpnStdBidPblancInfo)."""
-        endpoint = f"{self.base_url}/ao/PubDataOpnStdService/getDataSetOpnStdBidPblancInfo"
+        endpoint = _BID_ANNOUNCEMENT_URL
         
         params = {
-            "ServiceKey": self.service_key,
+            **self._params_template,
             "numOfRows": num_rows,
-            "pageNo": page_no,
-            "type": "json"
+            "pageNo": page_no
         }
         
-        if bid_notice_start_date:
-            params["bidNtceBgnDt"] = bid_notice_start_date
-        if bid_notice_end_date:
-            params["bidNtceEndDt"] = bid_notice_end_date
+        _add_optional_params(params, _BID_ANNOUNCEMENT_OPTIONAL_KEYS, (
+            bid_notice_start_date,
+            bid_notice_end_date
+        ))
             
         # FastMCP의 자동 생성된 클라이언트 사용 시뮬레이션
         return {
             "endpoint": endpoint,
             "params": params,
+            "url": _request_url(endpoint, params),
             "description": "입찰공고정보 조회",
             "method": "GET"
         }
@@ -73,24 +228,24 @@ class OpenAPITools:
         opening_end_date: Optional[str] = None
     ) -> Dict[str, Any]:
         """낙찰정보 조회 (getDataSetOpnStdScsbidInfo)."""
-        endpoint = f"{self.base_url}/ao/PubDataOpnStdService/getDataSetOpnStdScsbidInfo"
+        endpoint = _SUCCESSFUL_BID_URL
         
         params = {
-            "ServiceKey": self.service_key,
+            **self._params_template,
             "numOfRows": num_rows,
             "pageNo": page_no,
-            "bsnsDivCd": business_div_code,
-            "type": "json"
+            "bsnsDivCd": business_div_code
         }
         
-        if opening_start_date:
-            params["opengBgnDt"] = opening_start_date
-        if opening_end_date:
-            params["opengEndDt"] = opening_end_date
+        _add_optional_params(params, _SUCCESSFUL_BID_OPTIONAL_KEYS, (
+            opening_start_date,
+            opening_end_date
+        ))
             
         return {
             "endpoint": endpoint,
             "params": params,
+            "url": _request_url(endpoint, params),
             "description": "낙찰정보 조회",
             "method": "GET"
         }
@@ -105,27 +260,25 @@ class OpenAPITools:
         institution_code: Optional[str] = None
     ) -> Dict[str, Any]:
         """계약정보 조회 (getDataSetOpnStdCntrctInfo)."""
-        endpoint = f"{self.base_url}/ao/PubDataOpnStdService/getDataSetOpnStdCntrctInfo"
+        endpoint = _CONTRACT_URL
         
         params = {
-            "ServiceKey": self.service_key,
+            **self._params_template,
             "numOfRows": num_rows,
-            "pageNo": page_no,
-            "type": "json"
+            "pageNo": page_no
         }
         
-        if contract_start_date:
-            params["cntrctCnclsBgnDate"] = contract_start_date
-        if contract_end_date:
-            params["cntrctCnclsEndDate"] = contract_end_date
-        if institution_div_code:
-            params["insttDivCd"] = institution_div_code
-        if institution_code:
-            params["insttCd"] = institution_code
+        _add_optional_params(params, _CONTRACT_OPTIONAL_KEYS, (
+            contract_start_date,
+            contract_end_date,
+            institution_div_code,
+            institution_code
+        ))
             
         return {
             "endpoint": endpoint,
             "params": params,
+            "url": _request_url(endpoint, params),
             "description": "계약정보 조회",
             "method": "GET"
         }
@@ -137,13 +290,12 @@ class OpenAPITools:
         search_base_year: Optional[str] = None
     ) -> Dict[str, Any]:
         """전체 공공조달 현황 (getTotlPubPrcrmntSttus)."""
-        endpoint = f"{self.base_url}/at/PubPrcrmntStatInfoService/getTotlPubPrcrmntSttus"
+        endpoint = _TOTAL_PROCUREMENT_URL
         
         params = {
-            "ServiceKey": self.service_key,
+            **self._params_template,
             "numOfRows": num_rows,
-            "pageNo": page_no,
-            "type": "json"
+            "pageNo": page_no
         }
         
         if search_base_year:
@@ -152,6 +304,7 @@ class OpenAPITools:
         return {
             "endpoint": endpoint,
             "params": params,
+            "url": _request_url(endpoint, params),
             "description": "전체 공공조달 현황",
             "method": "GET"
         }
@@ -170,39 +323,48 @@ class OpenAPITools:
         product_certification: Optional[str] = None
     ) -> Dict[str, Any]:
         """다수공급자계약 품목정보 조회 (getMASCntrctPrdctInfoList) - 핵심 API."""
-        endpoint = f"{self.base_url}/at/ShoppingMallPrdctInfoService/getMASCntrctPrdctInfoList"
+        endpoint = _MAS_CONTRACT_PRODUCT_URL
         
         params = {
-            "ServiceKey": self.service_key,
+            **self._params_template,
             "numOfRows": num_rows,
-            "pageNo": page_no,
-            "type": "json"
+            "pageNo": page_no
         }
         
-        if registration_start_date:
-            params["rgstDtBgnDt"] = registration_start_date
-        if registration_end_date:
-            params["rgstDtEndDt"] = registration_end_date
-        if product_name:
-            params["prdctClsfcNoNm"] = product_name
-        if product_id:
-            params["prdctIdntNo"] = product_id
-        if contract_company_name:
-            params["cntrctCorpNm"] = contract_company_name
-        if change_start_date:
-            params["chgDtBgnDt"] = change_start_date
-        if change_end_date:
-            params["chgDtEndDt"] = change_end_date
-        if product_certification:
-            params["prodctCertYn"] = product_certification
+        _add_optional_params(params, _MAS_CONTRACT_PRODUCT_OPTIONAL_KEYS, (
+            registration_start_date,
+            registration_end_date,
+            product_name,
+            product_id,
+            contract_company_name,
+            change_start_date,
+            change_end_date,
+            product_certification
+        ))
             
         return {
             "endpoint": endpoint,
             "params": params,
+            "url": _request_url(endpoint, params),
             "description": "다수공급자계약 품목정보 조회 - 핵심 API",
             "method": "GET"
         }
 
 
-# Global instance
-openapi_tools = OpenAPITools()
\ No newline at end of file
+# Global instance - lazy initialization
+_openapi_tools: Optional[OpenAPITools] = None
+
+
+def get_openapi_tools() -> OpenAPITools:
+    """Get or create the OpenAPITools instance with lazy initialization."""
+    global _openapi_tools
+    if _openapi_tools is None:
+        _openapi_tools = OpenAPITools()
+    return _openapi_tools
+
+
+def __getattr__(name: str) -> Any:
+    """Keep ``from .openapi_tools import openapi_tools`` working, built on first access."""
+    if name == "openapi_tools":
+        return get_openapi_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,10 @@
 import os
 import sys
 import logging
-from pathlib import Path
+
+# Add src to path once, at import
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+sys.path.insert(0, SRC_PATH)
 
 # Configure logging for Render
 logging.basicConfig(
@@ -32,10 +35,6 @@ def main():
     
     # Import and run the main server
     try:
-        # Add src to path
-        src_path = Path(__file__).parent / "src"
-        sys.path.insert(0, str(src_path))
-        
         from main import main as server_main
         return server_main()
         
@@ -0,0 +1,45 @@
+"""Shared pytest configuration."""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Create the test FastAPI app once per session."""
+    from src.api.app import create_app
+
+    app = create_app()
+    app.debug = True
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Create a test client shared by the whole session.
+    
+    TestClient already talks to the ASGI app in-process (no sockets), so
+    reusing one client saves the per-test app and transport setup.
+    """
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def plaintext_crypt_context():
+    """Password context that skips the bcrypt KDF.
+    
+    bcrypt is deliberately slow and every AuthService() hashes its seed
+    users, so tests that only need a working password check use this.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["plaintext"])
+
+
+@pytest.fixture(scope="session")
+def server():
+    """Import server.py once per session, on first use rather than at collection."""
+    import server  # type: ignore
+
+    return server
@@ -2,47 +2,29 @@
 
 import json
 import os
-import sys
 from unittest.mock import Mock, patch
 
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 # Mock environment variables before importing
 os.environ.setdefault("NARAMARKET_SERVICE_KEY", "test_service_key")
 os.environ.setdefault("JWT_SECRET_KEY", "test_secret_key_for_testing")
 
-from api.app import create_app
-from services.auth import auth_service
-
-
-@pytest.fixture
-def app():
-    """Create test FastAPI app."""
-    app = create_app()
-    app.debug = True
-    return app
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return TestClient(app)
+from src.core.models import ServiceResult
+from src.services.auth import auth_service
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def auth_headers(client):
-    """Get authentication headers for testing."""
+    """Get authentication headers, logging in once per module."""
     # Login to get token
     response = client.post("/auth/login", json={
         "username": "admin",
         "password": "admin123"
     })
     assert response.status_code == 200
-    token_data = response.json()
+    token_data = orjson.loads(response.content)
     
     return {"Authorization": f"Bearer {token_data['access_token']}"}
 
@@ -54,7 +36,7 @@ class TestBasicEndpoints:
         """Test API root endpoint."""
         response = client.get("/api/v1/")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "message" in data
         assert "version" in data
     
@@ -62,7 +44,7 @@ class TestBasicEndpoints:
         """Test health check endpoint."""
         response = client.get("/api/v1/health")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["status"] == "healthy"
         assert "timestamp" in data
     
@@ -70,7 +52,7 @@ class TestBasicEndpoints:
         """Test server info endpoint."""
         response = client.get("/api/v1/server/info")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["success"] is True
         assert "app" in data
         assert "version" in data
@@ -88,7 +70,7 @@ class TestAuthenticationEndpoints:
             "password": "admin123"
         })
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "access_token" in data
         assert "token_type" in data
         assert data["token_type"] == "bearer"
@@ -111,7 +93,7 @@ class TestAuthenticationEndpoints:
             "grant_type": "password"
         })
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "access_token" in data
         assert data["token_type"] == "bearer"
     
@@ -124,21 +106,21 @@ class TestAuthenticationEndpoints:
         """Test protected endpoint with authentication."""
         response = client.get("/auth/protected", headers=auth_headers)
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "message" in data
     
     def test_admin_only_endpoint(self, client, auth_headers):
         """Test admin-only endpoint."""
         response = client.get("/auth/admin-only", headers=auth_headers)
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "message" in data
     
     def test_get_current_user(self, client, auth_headers):
         """Test get current user endpoint."""
         response = client.get("/auth/me", headers=auth_headers)
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "username" in data
         assert "email" in data
         assert "is_active" in data
@@ -167,7 +149,7 @@ class TestCrawlEndpoints:
         })
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["success"] is True
         assert "items" in data
         assert len(data["items"]) == 1
@@ -203,9 +185,37 @@ class TestCrawlEndpoints:
         })
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["success"] is True
         assert "attributes" in data
+    
+    @patch('src.services.crawler.crawler_service.crawl_to_csv')
+    def test_crawl_csv_stream_frames(self, mock_crawl, client):
+        """Test that progress frames end with a done frame nesting the result."""
+        def fake_crawl(**kwargs):
+            kwargs["progress_cb"]({"windows_processed": 1, "total_products": 3})
+            return ServiceResult.ok({"success": True, "rows": 3})
+        
+        mock_crawl.side_effect = fake_crawl
+        
+        response = client.post("/api/v1/crawl/csv/stream", json={
+            "category": "test_category",
+            "output_csv": "test.csv"
+        })
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [
+            orjson.loads(line[len("data: "):])
+            for line in response.text.split("\n\n") if line
+        ]
+        assert frames == [
+            {"windows_processed": 1, "total_products": 3},
+            {
+                "done": True,
+                "result": {"success": True, "data": {"success": True, "rows": 3}, "error": None}
+            }
+        ]
 
 
 class TestFileEndpoints:
@@ -214,11 +224,11 @@ class TestFileEndpoints:
     @patch('src.services.file_processor.file_processor_service.save_results')
     def test_save_results_success(self, mock_save, client):
         """Test save results endpoint."""
-        mock_save.return_value = {
+        mock_save.return_value = ServiceResult.ok({
             "success": True,
             "filename": "test.json",
             "products_count": 5
-        }
+        })
         
         response = client.post("/api/v1/files/save", json={
             "products": [{"id": 1}, {"id": 2}],
@@ -226,7 +236,7 @@ class TestFileEndpoints:
         })
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["success"] is True
         assert data["filename"] == "test.json"
     
@@ -244,7 +254,7 @@ class TestFileEndpoints:
         
         response = client.get("/api/v1/files/list?pattern=*.json")
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert isinstance(data, list)
         assert len(data) == 1
         assert data[0]["filename"] == "test.json"
@@ -278,10 +288,14 @@ class TestErrorHandling:
 
 @pytest.fixture(autouse=True)
 def cleanup_auth_tokens():
-    """Clean up authentication tokens after each test."""
+    """Revoke the tokens issued during each test."""
+    # Module-scoped fixtures such as auth_headers are set up before this
+    # snapshot, so their tokens survive
+    existing = set(auth_service.active_tokens)
     yield
-    # Clear active tokens
-    auth_service.active_tokens.clear()
+    for token in list(auth_service.active_tokens):
+        if token not in existing:
+            del auth_service.active_tokens[token]
 
 
 if __name__ == "__main__":
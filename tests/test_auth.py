@@ -1,58 +1,66 @@
 """Tests for authentication service."""
 
 import os
-import sys
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
 # Mock environment variables
 os.environ.setdefault("NARAMARKET_SERVICE_KEY", "test_service_key")
 os.environ.setdefault("JWT_SECRET_KEY", "test_secret_key_for_testing")
 
-from services.auth import AuthService
+import src.services.auth as auth_module
+from src.services.auth import AuthService, UserRecord
+
+
+@pytest.fixture
+def auth_service(monkeypatch, plaintext_crypt_context):
+    """Create auth service instance for testing, without real bcrypt."""
+    # Only patched while constructing, so bcrypt_auth_service stays real
+    with monkeypatch.context() as mp:
+        mp.setattr(
+            auth_module, "CryptContext", lambda *args, **kwargs: plaintext_crypt_context
+        )
+        return AuthService()
 
 
 @pytest.fixture
-def auth_service():
-    """Create auth service instance for testing."""
+def bcrypt_auth_service():
+    """Create auth service instance with its real bcrypt context."""
     return AuthService()
 
 
 class TestPasswordHashing:
     """Test password hashing functionality."""
     
-    def test_password_hashing(self, auth_service):
+    def test_password_hashing(self, bcrypt_auth_service):
         """Test password hashing and verification."""
         password = "test_password_123"
         
         # Hash password
-        hashed = auth_service.get_password_hash(password)
+        hashed = bcrypt_auth_service.get_password_hash(password)
         assert isinstance(hashed, str)
         assert len(hashed) > 0
         assert hashed != password  # Should be different from plain text
         
         # Verify correct password
-        assert auth_service.verify_password(password, hashed) is True
+        assert bcrypt_auth_service.verify_password(password, hashed) is True
         
         # Verify incorrect password
-        assert auth_service.verify_password("wrong_password", hashed) is False
+        assert bcrypt_auth_service.verify_password("wrong_password", hashed) is False
     
-    def test_different_hashes_for_same_password(self, auth_service):
+    def test_different_hashes_for_same_password(self, bcrypt_auth_service):
         """Test that same password produces different hashes."""
         password = "same_password"
-        hash1 = auth_service.get_password_hash(password)
-        hash2 = auth_service.get_password_hash(password)
+        hash1 = bcrypt_auth_service.get_password_hash(password)
+        hash2 = bcrypt_auth_service.get_password_hash(password)
         
         # Hashes should be different due to salt
         assert hash1 != hash2
         
         # But both should verify correctly
-        assert auth_service.verify_password(password, hash1) is True
-        assert auth_service.verify_password(password, hash2) is True
+        assert bcrypt_auth_service.verify_password(password, hash1) is True
+        assert bcrypt_auth_service.verify_password(password, hash2) is True
 
 
 class TestUserAuthentication:
@@ -62,9 +70,9 @@ class TestUserAuthentication:
         """Test successful user authentication."""
         user = auth_service.authenticate_user("admin", "admin123")
         assert user is not None
-        assert user["username"] == "admin"
-        assert user["is_active"] is True
-        assert "scopes" in user
+        assert user.username == "admin"
+        assert user.is_active is True
+        assert "admin" in user.scopes
     
     def test_authenticate_user_wrong_password(self, auth_service):
         """Test authentication with wrong password."""
@@ -79,13 +87,13 @@ class TestUserAuthentication:
     def test_authenticate_inactive_user(self, auth_service):
         """Test authentication with inactive user."""
         # Add inactive user to test db
-        auth_service.users_db["inactive_user"] = {
-            "username": "inactive_user",
-            "email": "inactive@test.com",
-            "hashed_password": auth_service.get_password_hash("password"),
-            "is_active": False,
-            "scopes": ["read"]
-        }
+        auth_service.users_db["inactive_user"] = UserRecord(
+            username="inactive_user",
+            email="inactive@test.com",
+            hashed_password=auth_service.get_password_hash("password"),
+            is_active=False,
+            scopes=["read"]
+        )
         
         user = auth_service.authenticate_user("inactive_user", "password")
         assert user is None
@@ -263,6 +271,38 @@ class TestTokenCleanup:
         assert token2 in auth_service.active_tokens
 
 
+class TestUserLookup:
+    """Test cached user lookups."""
+    
+    def test_get_user_cached(self, auth_service):
+        """Test that repeated lookups are served from cache."""
+        user = auth_service.get_user("admin")
+        assert user is not None
+        assert user.username == "admin"
+        
+        # Cached entry survives removal from the backing store
+        del auth_service.users_db["admin"]
+        assert auth_service.get_user("admin") is user
+    
+    def test_invalidate_user(self, auth_service):
+        """Test that invalidation forces a fresh users_db lookup."""
+        assert auth_service.get_user("admin") is not None
+        del auth_service.users_db["admin"]
+        
+        auth_service.invalidate_user("admin")
+        assert auth_service.get_user("admin") is None
+    
+    def test_get_user_nonexistent_not_cached(self, auth_service):
+        """Test that missing users are not negatively cached."""
+        assert auth_service.get_user("late_user") is None
+        auth_service.users_db["late_user"] = UserRecord(
+            username="late_user",
+            email="late@test.com",
+            hashed_password=""
+        )
+        assert auth_service.get_user("late_user") is not None
+
+
 class TestUserScopes:
     """Test user scope management."""
     
@@ -281,11 +321,16 @@ class TestUserScopes:
 
 
 @pytest.fixture(autouse=True)
-def cleanup_tokens(auth_service):
-    """Clean up tokens after each test."""
+def cleanup_tokens(request):
+    """Clean up tokens after each test, on whichever service it used."""
+    services = [
+        request.getfixturevalue(name)
+        for name in ("auth_service", "bcrypt_auth_service")
+        if name in request.fixturenames
+    ]
     yield
-    if hasattr(auth_service, 'active_tokens'):
-        auth_service.active_tokens.clear()
+    for service in services:
+        service.active_tokens.clear()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,480 @@
+"""Tests for the crawling service's window pipeline and CSV conversion."""
+
+import csv
+import glob
+import io
+import os
+import threading
+import time
+
+import orjson
+import pytest
+
+# Mock environment variables before importing
+os.environ.setdefault("NARAMARKET_SERVICE_KEY", "test_service_key")
+
+import src.services.crawler as crawler_module
+from src.services.crawler import CrawlingService, _compile_row_builder, _CsvRowEncoder, _ROW_EXPRS
+
+CATEGORY = "데스크톱컴퓨터"
+ANCHOR = "20240131"
+
+
+class SimulatedCrash(BaseException):
+    """Stands in for the process dying; the crawl catches plain Exceptions."""
+
+
+class FakeClient:
+    """Deterministic list/detail API: a few pages of items per window.
+
+    ``crash_at`` is an (inqryEndDate, pageNo) pair whose list call raises
+    SimulatedCrash; ``slow`` makes older windows answer later, so concurrent
+    windows finish out of order.
+    """
+
+    def __init__(self, pages=2, per_page=3, crash_at=None, slow=False):
+        self.pages = pages
+        self.per_page = per_page
+        self.crash_at = crash_at
+        self.slow = slow
+        self.list_calls = []
+        self._lock = threading.Lock()
+
+    def call_list_api(self, params):
+        end = params["inqryEndDate"]
+        page = params["pageNo"]
+        with self._lock:
+            self.list_calls.append((params["inqryBgnDate"], end, page))
+        if self.crash_at == (end, page):
+            raise SimulatedCrash(end)
+        if self.slow:
+            # Newest windows (crawled first) answer slowest
+            time.sleep((int(end) % 100) / 2000)
+        if page > self.pages:
+            return {"response": {"body": {"items": []}}}
+        return {"response": {"body": {"items": [
+            {
+                "prdctIdntNo": f"{end}-{page}-{i}",
+                "prdctStndrdNo": f"{end}-{page}-{i}",
+                "prdctClsfcNo": f"cls {i}",
+                "prdctNm": f'Item "{i}", rev\n{page}' if i == 0 else f"item {i}"
+            }
+            for i in range(self.per_page)
+        ]}}}
+
+    def call_detail_api(self, payload):
+        # Every third item's lookup fails, so detail_success mixes 1 and 0
+        if payload["prdctStndrdNo"].endswith("-2"):
+            raise RuntimeError("detail lookup failed")
+        return {"resultList": [
+            {"prdctAtrbNm": "색상", "prdctAtrbVl": "검정, 흰색"},
+            {"prdctAtrbNm": "size", "prdctAtrbVl": 'L "large"'},
+        ]}
+
+    def windows_fetched(self):
+        """(begin, end) of every window whose list API was called."""
+        return {(bgn, end) for bgn, end, _ in self.list_calls}
+
+
+@pytest.fixture
+def make_service(monkeypatch, tmp_path):
+    """Build CrawlingService instances around a given fake client."""
+    monkeypatch.setattr(crawler_module, "OUTPUT_DIR", str(tmp_path))
+
+    def make(client):
+        monkeypatch.setattr(crawler_module, "get_api_client", lambda: client)
+        return CrawlingService()
+
+    return make
+
+
+def crawl(service, output_csv, **kwargs):
+    """Run a 40-day crawl in 10-day windows ending at ANCHOR by default."""
+    params = {
+        "total_days": 40,
+        "window_days": 10,
+        "anchor_end_date": ANCHOR,
+        "delay_sec": 0,
+    }
+    params.update(kwargs)
+    return service.crawl_to_csv(CATEGORY, str(output_csv), **params)
+
+
+def read_rows(path):
+    """Parse a CSV written by the crawler into a list of rows."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.reader(f))
+
+
+class TestCheckpointResume:
+    """Test that an interrupted crawl resumes without losing or repeating rows."""
+
+    def test_resume_fetches_only_remaining_windows(self, make_service, tmp_path):
+        """Test that a rerun skips checkpointed windows and matches a clean crawl."""
+        reference_csv = tmp_path / "reference.csv"
+        assert crawl(make_service(FakeClient()), reference_csv).success
+
+        # Crash in the third window (20240102-20240111), after its first page
+        output_csv = tmp_path / "out.csv"
+        crashing = FakeClient(crash_at=("20240111", 2))
+        with pytest.raises(SimulatedCrash):
+            crawl(make_service(crashing), output_csv)
+
+        checkpoint_path = f"{output_csv}.ckpt"
+        assert os.path.exists(checkpoint_path)
+        with open(checkpoint_path, encoding="utf-8") as f:
+            entries = [orjson.loads(line) for line in f]
+        assert [entry["windows_processed"] for entry in entries] == [1, 2]
+        last = entries[-1]
+        assert last["next_end"].startswith("2024-01-11")
+
+        # Bytes written past the checkpoint must be dropped on resume
+        with open(last["temp_ndjson"], "ab") as f:
+            f.write(b'{"prdctIdntNo": "torn')
+
+        # Resuming means calling again without anchor_end_date
+        resumed = FakeClient()
+        result = crawl(make_service(resumed), output_csv, anchor_end_date=None)
+        assert result.success
+        assert resumed.windows_fetched() == {
+            ("20240102", "20240111"),
+            ("20231223", "20240101"),
+        }
+        assert result.data["windows_processed"] == 4
+
+        with open(reference_csv, "rb") as f:
+            expected = f.read()
+        with open(output_csv, "rb") as f:
+            assert f.read() == expected
+
+        header, *rows = read_rows(output_csv)
+        id_col = header.index("prdctIdntNo")
+        ids = [row[id_col] for row in rows]
+        assert len(ids) == len(set(ids)) == 4 * 2 * 3
+
+    def test_success_cleans_up(self, make_service, tmp_path):
+        """Test that a finished crawl leaves no checkpoint, parts or temp file."""
+        output_csv = tmp_path / "out.csv"
+        result = crawl(make_service(FakeClient()), output_csv)
+
+        assert result.success
+        assert result.data["temp_deleted"] is True
+        assert not os.path.exists(f"{output_csv}.ckpt")
+        assert os.listdir(tmp_path / ".scratch") == []
+
+    def test_checkpoint_for_other_category_is_ignored(self, make_service, tmp_path):
+        """Test that a checkpoint only resumes the category it was written for."""
+        output_csv = tmp_path / "out.csv"
+        with pytest.raises(SimulatedCrash):
+            crawl(make_service(FakeClient(crash_at=("20240111", 1))), output_csv)
+
+        service = make_service(FakeClient())
+        assert service._load_checkpoint(f"{output_csv}.ckpt", CATEGORY) is not None
+        assert service._load_checkpoint(f"{output_csv}.ckpt", "운영체제") is None
+
+    def test_torn_checkpoint_line_is_skipped(self, make_service, tmp_path):
+        """Test that a half-written last entry falls back to the one before."""
+        output_csv = tmp_path / "out.csv"
+        with pytest.raises(SimulatedCrash):
+            crawl(make_service(FakeClient(crash_at=("20240111", 1))), output_csv)
+
+        checkpoint_path = f"{output_csv}.ckpt"
+        with open(checkpoint_path, "a", encoding="utf-8") as f:
+            f.write('{"category": "')
+
+        entry = make_service(FakeClient())._load_checkpoint(checkpoint_path, CATEGORY)
+        assert entry["windows_processed"] == 2
+
+
+class MalformedDetailClient(FakeClient):
+    """Detail API whose answers for the second item on each page are garbage."""
+
+    def call_detail_api(self, payload):
+        if payload["prdctStndrdNo"].endswith("-1"):
+            # Not a dict, then an unhashable attribute name
+            if payload["prdctStndrdNo"].startswith(ANCHOR):
+                return ["unexpected"]
+            return {"resultList": [{"prdctAtrbNm": ["x"], "prdctAtrbVl": "y"}]}
+        return super().call_detail_api(payload)
+
+
+class TestDetailFetch:
+    """Test that one bad detail response fails only its own item."""
+
+    def test_malformed_detail_keeps_page_rows(self, make_service, tmp_path):
+        """Test that rows after a malformed detail payload are still written."""
+        output_csv = tmp_path / "out.csv"
+        result = crawl(make_service(MalformedDetailClient()), output_csv)
+
+        assert result.success
+        assert result.data["total_products"] == 4 * 2 * 3
+        assert result.data["failed_details"] == 4 * 2 * 2
+        assert result.data["success_details"] == 4 * 2
+
+        header, *rows = read_rows(output_csv)
+        assert len(rows) == result.data["rows"] == 4 * 2 * 3
+        id_col = header.index("prdctIdntNo")
+        ok_col = header.index("detail_success")
+        ok_by_id = {row[id_col]: row[ok_col] for row in rows}
+        assert len(ok_by_id) == len(rows)
+        assert {ok for item_id, ok in ok_by_id.items() if item_id.endswith("-0")} == {"1"}
+        assert {ok for item_id, ok in ok_by_id.items() if not item_id.endswith("-0")} == {"0"}
+
+
+class TestRateLimits:
+    """Test how delay_sec and the detail rate budget the API calls."""
+
+    def test_delay_paces_only_this_crawls_list_calls(self, make_service, monkeypatch, tmp_path):
+        """Test that each crawl gets its own list bucket and the detail rate is fixed."""
+        buckets = []
+
+        class RecordingBucket(crawler_module.TokenBucket):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.acquired = 0
+                buckets.append(self)
+
+            def acquire(self, tokens=1.0):
+                self.acquired += 1
+                super().acquire(tokens)
+
+        monkeypatch.setattr(crawler_module, "TokenBucket", RecordingBucket)
+        client = FakeClient()
+        service = make_service(client)
+        detail_bucket = buckets.pop()
+
+        assert crawl(service, tmp_path / "a.csv", delay_sec=0.01).success
+        assert crawl(service, tmp_path / "b.csv", delay_sec=0).success
+
+        paced, unpaced = buckets
+        assert paced.rate_per_sec == 100.0
+        assert unpaced.rate_per_sec is None
+        assert paced.acquired + unpaced.acquired == len(client.list_calls)
+        assert detail_bucket.rate_per_sec == crawler_module.DETAIL_RATE_PER_SEC
+        assert detail_bucket.acquired == 2 * 4 * 2 * 3
+
+
+class TestConcurrentWindows:
+    """Test that concurrent window crawling matches a serial crawl."""
+
+    @pytest.mark.parametrize("explode_attributes", [False, True])
+    def test_matches_serial_output(self, make_service, monkeypatch, tmp_path, explode_attributes):
+        """Test that out-of-order window completion still yields serial output."""
+        monkeypatch.setattr(crawler_module, "WINDOW_CONCURRENCY", 1)
+        serial_csv = tmp_path / "serial.csv"
+        serial = crawl(
+            make_service(FakeClient()), serial_csv, explode_attributes=explode_attributes
+        )
+
+        monkeypatch.setattr(crawler_module, "WINDOW_CONCURRENCY", 4)
+        concurrent_csv = tmp_path / "concurrent.csv"
+        concurrent = crawl(
+            make_service(FakeClient(slow=True)), concurrent_csv,
+            explode_attributes=explode_attributes
+        )
+
+        assert serial.success and concurrent.success
+        for key in ("windows_processed", "pages_processed", "total_products", "rows"):
+            assert concurrent.data[key] == serial.data[key]
+        with open(serial_csv, "rb") as f:
+            expected = f.read()
+        with open(concurrent_csv, "rb") as f:
+            assert f.read() == expected
+
+    def test_crash_removes_parts(self, make_service, tmp_path):
+        """Test that windows in flight at a crash leave no part files."""
+        output_csv = tmp_path / "out.csv"
+        with pytest.raises(SimulatedCrash):
+            crawl(make_service(FakeClient(crash_at=("20240131", 1))), output_csv)
+
+        assert glob.glob(str(tmp_path / ".scratch" / "*.part*")) == []
+
+    def test_window_order_is_newest_first(self, make_service, tmp_path):
+        """Test that rows appear in window order regardless of completion order."""
+        output_csv = tmp_path / "out.csv"
+        assert crawl(make_service(FakeClient(slow=True)), output_csv).success
+
+        rows = read_rows(output_csv)
+        end_col = rows[0].index("window_end")
+        window_ends = list(dict.fromkeys(row[end_col] for row in rows[1:]))
+        assert window_ends == ["20240131", "20240121", "20240111", "20240101"]
+
+
+class TestCsvRowEncoder:
+    """Test that _CsvRowEncoder writes exactly what csv.writer writes."""
+
+    @staticmethod
+    def csv_writer_bytes(rows):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow(row)
+        return buf.getvalue().encode("utf-8")
+
+    @pytest.mark.parametrize("row", [
+        ["plain", "with space", "한글"],
+        ["a,b", 'say "hi"', "line\nbreak", "cr\rreturn", "crlf\r\n"],
+        ['"', '""', ",", "\n"],
+        ["", "x", ""],
+        [""],
+        [None],
+        [None, None],
+        [1, 2.5, -3, True, False],
+        [" leading", "trailing ", "\ttab", "'single'"],
+        ["mixed", None, 0, "", "a\"b,c\nd"],
+    ])
+    def test_matches_csv_writer(self, row):
+        """Test byte-identical output for tricky fields."""
+        assert _CsvRowEncoder().encode_row(row) == self.csv_writer_bytes([row])
+
+    def test_cache_reset_keeps_output(self):
+        """Test that clearing the field cache mid-file doesn't change output."""
+        rows = [[f"v{i % 5}", f"{i},{i}", "same"] for i in range(50)]
+        encoder = _CsvRowEncoder(max_size=3)
+        assert b"".join(encoder.encode_row(row) for row in rows) == self.csv_writer_bytes(rows)
+
+
+def reference_row(sources, record, attributes):
+    """Plain-Python equivalent of a compiled row builder."""
+    row = []
+    for kind, key in sources:
+        if kind == "record":
+            row.append(record.get(key, ""))
+        elif kind == "attribute":
+            row.append(attributes.get(key, ""))
+        elif kind == "attributes_json":
+            row.append(orjson.dumps(attributes).decode() if attributes else "")
+        elif kind == "flag":
+            row.append("1" if record.get(key) else "0")
+        else:
+            row.append("")
+    return row
+
+
+class TestRowBuilder:
+    """Test the exec-compiled row builder against a plain-Python reference."""
+
+    SOURCES = [
+        ("record", "prdctIdntNo"),
+        ("record", "it's"),
+        ("record", 'quote"key'),
+        ("record", "back\\slash"),
+        ("record", "줄\n바꿈"),
+        ("attribute", "색상"),
+        ("attribute", "{brace}"),
+        ("attributes_json", None),
+        ("flag", "detail_success"),
+        ("missing", None),
+        ("record", "absent"),
+    ]
+
+    @pytest.mark.parametrize("record", [
+        {
+            "prdctIdntNo": "1",
+            "it's": "a",
+            'quote"key': "b",
+            "back\\slash": "c",
+            "줄\n바꿈": "d",
+            "detail_success": True,
+            "attributes": {"색상": "red", "{brace}": "x"},
+        },
+        {"prdctIdntNo": "2", "detail_success": False, "attributes": {}},
+        {"attributes": {"other": "y"}},
+    ])
+    def test_matches_reference(self, record):
+        """Test that odd key names survive code generation and values match."""
+        build_row = _compile_row_builder(tuple(
+            _ROW_EXPRS[kind].format(key=key) for kind, key in self.SOURCES
+        ))
+        attributes = record.get("attributes", {})
+        assert build_row(record, attributes) == reference_row(self.SOURCES, record, attributes)
+
+
+class TestArrowEngine:
+    """Test the pyarrow CSV engine against the Python engine."""
+
+    RECORDS = [
+        {
+            "prdctIdntNo": "1",
+            "prdctNm": 'Desk, "large"\nmodel',
+            "attributes": {"색상": "검정", "size": "L"},
+            "window_start": "20240101",
+            "window_end": "20240110",
+            "detail_success": True,
+        },
+        {
+            "prdctIdntNo": "2",
+            "attributes": {},
+            "window_start": "20240101",
+            "window_end": "20240110",
+            "detail_success": False,
+        },
+        {
+            "prdctIdntNo": "3",
+            "prdctNm": "한글 품목",
+            "attributes": {"size": "M"},
+            "window_start": "20231222",
+            "window_end": "20231231",
+            "detail_success": True,
+        },
+    ]
+
+    @staticmethod
+    def convert(service, tmp_path, records, engine):
+        temp_ndjson = tmp_path / "records.ndjson"
+        temp_ndjson.write_bytes(b"".join(orjson.dumps(r) + b"\n" for r in records))
+        output_csv = tmp_path / f"{engine}.csv"
+        result = service._convert_temp_to_csv(
+            temp_ndjson=str(temp_ndjson),
+            output_csv=str(output_csv),
+            existing_header=None,
+            explode_attributes=True,
+            sanitize=True,
+            append=False,
+            fail_on_new_columns=True,
+            csv_engine=engine
+        )
+        assert result["success"], result.get("error")
+        return result, read_rows(output_csv)
+
+    def test_matches_python_engine(self, make_service, tmp_path):
+        """Test that both engines produce the same parsed rows."""
+        service = make_service(FakeClient())
+        python_result, python_rows = self.convert(service, tmp_path, self.RECORDS, "python")
+        arrow_result, arrow_rows = self.convert(service, tmp_path, self.RECORDS, "pyarrow")
+
+        assert python_result["csv_engine"] == "python"
+        assert arrow_result["csv_engine"] == "pyarrow"
+        assert arrow_result["rows"] == python_result["rows"] == len(self.RECORDS)
+        assert arrow_rows == python_rows
+
+    @pytest.mark.parametrize("engine", ["python", "pyarrow"])
+    def test_sanitized_attribute_columns_keep_values(self, make_service, tmp_path, engine):
+        """Test that attribute keys needing sanitizing still fill their columns."""
+        service = make_service(FakeClient())
+        records = [
+            {**self.RECORDS[0], "attributes": {"CPU 속도": "3GHz", "RAM (GB)": "16"}},
+            {**self.RECORDS[2], "attributes": {"CPU 속도": "2GHz"}},
+        ]
+        result, (header, *rows) = self.convert(service, tmp_path, records, engine)
+
+        assert result["csv_engine"] == engine
+        assert result["attr_columns"] == ["CPU_속도", "RAM_GB"]
+        cpu = header.index("attr_CPU_속도")
+        ram = header.index("attr_RAM_GB")
+        assert [(row[cpu], row[ram]) for row in rows] == [("3GHz", "16"), ("2GHz", "")]
+
+    def test_falls_back_on_non_text_values(self, make_service, tmp_path):
+        """Test that a non-text value reruns the conversion in Python."""
+        service = make_service(FakeClient())
+        records = self.RECORDS + [{**self.RECORDS[0], "prdctIdntNo": 4, "prdctPrc": 1000}]
+        python_result, python_rows = self.convert(service, tmp_path, records, "python")
+        arrow_result, arrow_rows = self.convert(service, tmp_path, records, "pyarrow")
+
+        assert arrow_result["csv_engine"] == "python"
+        assert arrow_result["rows"] == len(records)
+        assert arrow_rows == python_rows
+        with open(tmp_path / "python.csv", "rb") as f:
+            expected = f.read()
+        with open(tmp_path / "pyarrow.csv", "rb") as f:
+            assert f.read() == expected
@@ -0,0 +1,186 @@
+"""Tests for file processing fast paths against stdlib csv results."""
+
+import csv
+import os
+
+import pytest
+
+# Mock environment variables before importing
+os.environ.setdefault("NARAMARKET_SERVICE_KEY", "test_service_key")
+
+from src.services.file_processor import FileProcessorService
+
+
+@pytest.fixture
+def service():
+    """Create file processor service instance for testing."""
+    return FileProcessorService()
+
+
+def write_csv(path, rows, encoding="utf-8-sig", newline="\r\n"):
+    """Write rows with csv.writer and return the path as str."""
+    with open(path, "w", newline="", encoding=encoding) as f:
+        writer = csv.writer(f, lineterminator=newline)
+        writer.writerows(rows)
+    return str(path)
+
+
+def read_rows(path):
+    """Parse a CSV file into a list of rows."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.reader(f))
+
+
+def reference_merge(paths):
+    """Union header in order of first appearance, rows remapped by column name."""
+    header = []
+    rows = []
+    for path in sorted(paths):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for col in reader.fieldnames or []:
+                if col not in header:
+                    header.append(col)
+            rows.extend(reader)
+    return [header] + [[row.get(col) or "" for col in header] for row in rows]
+
+
+class TestMergeCsvFiles:
+    """Test merge_csv_files against a DictReader-based reference."""
+
+    def test_same_headers(self, service, tmp_path):
+        """Test that files with one header are concatenated as-is."""
+        paths = [
+            write_csv(tmp_path / "part_1.csv", [["id", "name"], ["1", "a"], ["2", 'b, "x"']]),
+            write_csv(tmp_path / "part_2.csv", [["id", "name"], ["3", "줄\n바꿈"]]),
+        ]
+        result = service.merge_csv_files(str(tmp_path / "part_*.csv"), str(tmp_path / "merged.csv"))
+
+        assert result.success
+        assert result.data["total_rows"] == 3
+        assert read_rows(tmp_path / "merged.csv") == reference_merge(paths)
+
+    def test_remaps_differing_headers(self, service, tmp_path):
+        """Test that reordered, missing and extra columns land under their names."""
+        paths = [
+            write_csv(tmp_path / "part_1.csv", [["id", "name"], ["1", "a"]]),
+            write_csv(tmp_path / "part_2.csv", [["name", "id", "price"], ["b", "2", "1,000"]]),
+            write_csv(tmp_path / "part_3.csv", [["price", "color"], ["3", "red"], ["4"]]),
+        ]
+        result = service.merge_csv_files(str(tmp_path / "part_*.csv"), str(tmp_path / "merged.csv"))
+
+        assert result.success
+        expected = reference_merge(paths)
+        assert expected[0] == ["id", "name", "price", "color"]
+        assert read_rows(tmp_path / "merged.csv") == expected
+        assert result.data["total_rows"] == len(expected) - 1
+
+    def test_skips_output_matching_pattern(self, service, tmp_path):
+        """Test that an output file matched by the pattern isn't read back in."""
+        paths = [
+            write_csv(tmp_path / "part_1.csv", [["id"], ["1"]]),
+            write_csv(tmp_path / "part_2.csv", [["id"], ["2"]]),
+        ]
+        output_csv = tmp_path / "part_merged.csv"
+        write_csv(output_csv, [["stale"], ["x"]])
+
+        result = service.merge_csv_files(str(tmp_path / "part_*.csv"), str(output_csv))
+
+        assert result.success
+        assert read_rows(output_csv) == reference_merge(paths)
+
+
+class TestConvertJsonToParquet:
+    """Test how convert_json_to_parquet tells JSON from NDJSON input."""
+
+    @pytest.mark.parametrize("filename,content,rows", [
+        ("data.json", b'[{"id": "1"}, {"id": "2"}]', 2),
+        ("data.json", b'{"id": "1"}\n{"id": "2"}\n', 2),
+        ("data.jsonl", b'{"id": "1"}\n', 1),
+        ("data.ndjson", b'{"id": "1"}\n\n{"id": "2"}', 2),
+    ])
+    def test_converts_lists_and_ndjson(self, service, tmp_path, filename, content, rows):
+        """Test that JSON lists and NDJSON files are both converted."""
+        path = tmp_path / filename
+        path.write_bytes(content)
+        result = service.convert_json_to_parquet(str(path))
+
+        assert result.success, result.error
+        assert result.data["rows_converted"] == rows
+
+    @pytest.mark.parametrize("content", [b'{"id": "1"}', b'{"id": "1"}\n'])
+    def test_single_object_is_not_ndjson(self, service, tmp_path, content):
+        """Test that one object on one line is still rejected as not a list."""
+        path = tmp_path / "data.json"
+        path.write_bytes(content)
+        result = service.convert_json_to_parquet(str(path))
+
+        assert not result.success
+        assert result.error == "JSON file must contain a list of objects"
+
+
+class TestCountCsvRows:
+    """Test the quote-aware byte scan against csv.reader's row count."""
+
+    @staticmethod
+    def reader_count(path):
+        # csv.reader yields [] for a blank line; pandas skipped those
+        return max(len([row for row in read_rows(path) if row]) - 1, 0)
+
+    @pytest.mark.parametrize("rows,newline", [
+        ([["id", "name"], ["1", "a"], ["2", "b"]], "\r\n"),
+        ([["id", "name"], ["1", "a"], ["2", "b"]], "\n"),
+        ([["id", "note"], ["1", "line\nbreak"], ["2", "two\r\nlines\nhere"]], "\r\n"),
+        ([["id", "note"], ["1", 'quoted "word"\nnext'], ["2", '""']], "\n"),
+        ([["id", "note"], ["1", '"\n"'], ["2", ",\n,"]], "\r\n"),
+        ([["id"]], "\r\n"),
+    ])
+    def test_matches_csv_reader(self, tmp_path, rows, newline):
+        """Test that newlines inside quoted fields aren't counted as rows."""
+        path = write_csv(tmp_path / "data.csv", rows, newline=newline)
+        assert FileProcessorService._count_csv_rows(path) == self.reader_count(path)
+
+    def test_missing_final_newline(self, tmp_path):
+        """Test that a last row without a line ending still counts."""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b'id,note\r\n1,"a\nb"\r\n2,c')
+        assert FileProcessorService._count_csv_rows(str(path)) == self.reader_count(path) == 2
+
+    @pytest.mark.parametrize("content,rows", [
+        (b"id,note\r\n1,a\r\n2,b\r\n\r\n\r\n", 2),
+        (b"id,note\n1,a\n\n2,b\n\n", 2),
+        (b"\r\nid,note\r\n\r\n1,a", 1),
+        (b'id,note\n"1"\n""\n\n2,"\n\n"\n', 3),
+    ])
+    def test_blank_lines_are_skipped(self, tmp_path, content, rows):
+        """Test that blank lines outside quotes aren't counted as rows."""
+        path = tmp_path / "data.csv"
+        path.write_bytes(content)
+        assert FileProcessorService._count_csv_rows(str(path)) == self.reader_count(path) == rows
+
+    def test_blank_lines_across_chunks(self, tmp_path):
+        """Test that a blank-line run split by the 1 MiB read boundary is skipped."""
+        # Header (3 bytes) plus 2-byte rows end one byte short of the boundary
+        filler_rows = ((1 << 20) - 4) // 2
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"id\n" + b"1\n" * filler_rows + b"\n\n\n2\n")
+        assert FileProcessorService._count_csv_rows(str(path)) == self.reader_count(path) == filler_rows + 1
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file has no rows."""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"")
+        assert FileProcessorService._count_csv_rows(str(path)) == 0
+
+    def test_quoted_field_across_chunks(self, tmp_path):
+        """Test that quote state carries over the 1 MiB read boundary."""
+        # Filler rows up to just short of the first chunk boundary, then a
+        # quoted field whose newlines straddle it
+        # (fixed-width filler rows are 99 bytes: 6 + 1 + 90 + CRLF)
+        filler = [[f"{i:06d}", "y" * 90] for i in range(((1 << 20) - 600) // 99)]
+        straddling = "\n".join(["z" * 40] * 30) + '"q"'
+        rows = [["id", "note"], *filler, ["x", straddling], ["2", "tail\nend"], ["3", "plain"]]
+        path = write_csv(tmp_path / "data.csv", rows)
+        quoted_at = (tmp_path / "data.csv").read_bytes().index(b'"zzz')
+        assert quoted_at < 1 << 20 < quoted_at + len(straddling)
+        assert FileProcessorService._count_csv_rows(path) == self.reader_count(path) == len(rows) - 1
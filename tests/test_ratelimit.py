@@ -0,0 +1,50 @@
+"""Tests for token bucket rate limiting."""
+
+import time
+
+import pytest
+
+from src.core.ratelimit import TokenBucket
+
+
+class TestTokenBucket:
+    """Test TokenBucket pacing."""
+
+    def test_burst_is_immediate(self):
+        """Test that up to `burst` acquisitions do not wait."""
+        bucket = TokenBucket(rate_per_sec=1.0, burst=5)
+
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        assert time.monotonic() - start < 0.1
+
+    def test_waits_after_burst(self):
+        """Test that acquisitions beyond the burst are paced by the rate."""
+        bucket = TokenBucket(rate_per_sec=20.0, burst=1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        # Two refills at 20/sec take ~0.1s
+        assert time.monotonic() - start >= 0.09
+
+    def test_no_rate_is_unlimited(self):
+        """Test that a missing or non-positive rate disables limiting."""
+        for rate in (None, 0, -1):
+            bucket = TokenBucket(rate_per_sec=rate, burst=1)
+            start = time.monotonic()
+            for _ in range(100):
+                bucket.acquire()
+            assert time.monotonic() - start < 0.1
+
+    def test_set_rate(self):
+        """Test that set_rate switches between limited and unlimited."""
+        bucket = TokenBucket(burst=1)
+        assert bucket.rate_per_sec is None
+
+        bucket.set_rate(10.0)
+        assert bucket.rate_per_sec == pytest.approx(10.0)
+
+        bucket.set_rate(None)
+        assert bucket.rate_per_sec is None
@@ -1,16 +1,12 @@
 """Tests for utility functions."""
 
-import os
-import sys
-import tempfile
+import time
+import types
 from datetime import datetime, timedelta
 
 import pytest
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from core.utils import (
+from src.core.utils import (
     calculate_elapsed_time,
     date_range_days_back,
     ensure_dir,
@@ -20,112 +16,146 @@ from core.utils import (
     sanitize_column_name
 )
 
+# Keys extract_g2b_params must always return
+_EXPECTED_G2B_KEYS = frozenset((
+    "prdctClsfcNoFst", "prdctClsfcNoScnd", "prdctClsfcNoThrd",
+    "prdctClsfcNoFrth", "prdctClsfcNoFfth", "prdctStndrdNo",
+    "mnfcturCmpnyNm", "mfgCmpnyNm", "mfgCmpnyNm2",
+    "mfgCmpnyNm3", "mfgCmpnyNm4", "mfgCmpnyNm5"
+))
+
+# extract_g2b_params inputs; the function only reads them
+_API_ITEM = {
+    "prdctClsfcNoFst": "123",
+    "prdctClsfcNoScnd": "456",
+    "prdctStndrdNo": "STD001",
+    "mnfcturCmpnyNm": "Test Company",
+    "otherField": "ignored"
+}
+_INCOMPLETE = {"prdctClsfcNoFst": "123"}
 
-class TestUtilityFunctions:
-    """Test utility functions."""
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Pin src.core.utils' clock so date helpers return exact strings."""
+    fake = datetime(2024, 1, 2, 3, 4, 5)
+    monkeypatch.setattr(
+        "src.core.utils.datetime",
+        types.SimpleNamespace(now=lambda: fake, strptime=datetime.strptime)
+    )
+    return fake
+
+
+def test_ensure_dir(tmp_path):
+    """Test directory creation."""
+    test_dir = tmp_path / "test_subdir"
+    assert not test_dir.exists()
     
-    def test_ensure_dir(self):
-        """Test directory creation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            test_dir = os.path.join(temp_dir, "test_subdir")
-            assert not os.path.exists(test_dir)
-            
-            ensure_dir(test_dir)
-            assert os.path.exists(test_dir)
-            assert os.path.isdir(test_dir)
-            
-            # Should not raise error if directory already exists
-            ensure_dir(test_dir)
-            assert os.path.exists(test_dir)
+    ensure_dir(str(test_dir))
+    assert test_dir.is_dir()
     
-    def test_now_ts(self):
-        """Test timestamp generation."""
-        ts = now_ts()
-        assert isinstance(ts, str)
-        assert len(ts) > 0
-        
-        # Should be parseable as datetime
-        parsed = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-        assert isinstance(parsed, datetime)
+    # Should not raise error if directory already exists
+    ensure_dir(str(test_dir))
+    assert test_dir.is_dir()
+
+
+def test_now_ts(frozen_now):
+    """Test timestamp generation."""
+    ts = now_ts()
+    assert isinstance(ts, str)
+    assert ts == "2024-01-02 03:04:05"
+
+
+def test_date_range_days_back(frozen_now):
+    """Test date range generation."""
+    end = frozen_now.strftime("%Y%m%d")  # YYYYMMDD format
     
-    def test_date_range_days_back(self):
-        """Test date range generation."""
-        # Test default (7 days)
-        range_data = date_range_days_back()
-        assert "inqryBgnDt" in range_data
-        assert "inqryEndDt" in range_data
-        assert len(range_data["inqryBgnDt"]) == 8  # YYYYMMDD format
-        assert len(range_data["inqryEndDt"]) == 8
-        
-        # Test custom days
-        range_data = date_range_days_back(30)
-        bgn_date = datetime.strptime(range_data["inqryBgnDt"], "%Y%m%d")
-        end_date = datetime.strptime(range_data["inqryEndDt"], "%Y%m%d")
-        diff = end_date - bgn_date
-        assert diff.days == 30
+    # Test default (7 days)
+    range_data = date_range_days_back()
+    assert range_data["inqryEndDt"] == end
+    assert range_data["inqryBgnDt"] == (frozen_now - timedelta(days=7)).strftime("%Y%m%d")
     
-    def test_extract_g2b_params(self):
-        """Test G2B parameter extraction."""
-        api_item = {
-            "prdctClsfcNoFst": "123",
-            "prdctClsfcNoScnd": "456", 
-            "prdctStndrdNo": "STD001",
-            "mnfcturCmpnyNm": "Test Company",
-            "otherField": "ignored"
-        }
-        
-        params = extract_g2b_params(api_item)
-        
-        assert params["prdctClsfcNoFst"] == "123"
-        assert params["prdctClsfcNoScnd"] == "456"
-        assert params["prdctStndrdNo"] == "STD001"
-        assert params["mnfcturCmpnyNm"] == "Test Company"
-        assert "otherField" not in params
-        
-        # Test with missing fields
-        incomplete_item = {"prdctClsfcNoFst": "123"}
-        params = extract_g2b_params(incomplete_item)
-        assert params["prdctClsfcNoFst"] == "123"
-        assert params["prdctClsfcNoScnd"] == ""  # Should default to empty string
+    # Test custom days
+    range_data = date_range_days_back(30)
+    assert range_data["inqryEndDt"] == end
+    assert range_data["inqryBgnDt"] == (frozen_now - timedelta(days=30)).strftime("%Y%m%d")
+
+
+@pytest.mark.parametrize("api_item,expected", [
+    (_API_ITEM, {
+        "prdctClsfcNoFst": "123",
+        "prdctClsfcNoScnd": "456",
+        "prdctStndrdNo": "STD001",
+        "mnfcturCmpnyNm": "Test Company"
+    }),
+    # Missing fields should default to empty string
+    (_INCOMPLETE, {"prdctClsfcNoFst": "123", "prdctClsfcNoScnd": ""}),
+])
+def test_extract_g2b_params(api_item, expected):
+    """Test G2B parameter extraction."""
+    params = extract_g2b_params(api_item)
     
-    def test_sanitize_column_name(self):
-        """Test column name sanitization."""
-        # Test special characters
-        assert sanitize_column_name("test column!@#") == "test_column___"
-        assert sanitize_column_name("test__column") == "test_column"
-        assert sanitize_column_name("__test__") == "test"
-        assert sanitize_column_name("한글컬럼명") == "한글컬럼명"  # Korean should be preserved
-        
-        # Test edge cases
-        assert sanitize_column_name("") == "unknown"
-        assert sanitize_column_name("123") == "123"
-        assert sanitize_column_name(None) == "unknown"
-        assert sanitize_column_name(123) == "123"
+    assert {key: params[key] for key in expected} == expected
+    assert "otherField" not in params
+
+
+@pytest.mark.parametrize("raw,expected", [
+    # Special characters
+    ("test column!@#", "test_column"),
+    ("test__column", "test_column"),
+    ("__test__", "test"),
+    ("한글컬럼명", "한글컬럼명"),  # Korean should be preserved
+    # Edge cases
+    ("", "unknown"),
+    ("123", "123"),
+    ("!@#", "unknown"),
+    (None, "None"),
+    (123, "123"),
+])
+def test_sanitize_column_name(raw, expected):
+    """Test column name sanitization."""
+    assert sanitize_column_name(raw) == expected
+
+
+def test_sanitize_column_name_non_str_keys():
+    """Test that equal non-str keys don't share a cached result."""
+    assert sanitize_column_name(1) == "1"
+    assert sanitize_column_name(True) == "True"
+    assert sanitize_column_name(123) == "123"
+    assert sanitize_column_name(123.0) == "123_0"
+    # Unhashable names are converted, not rejected by the cache
+    assert sanitize_column_name(["a b"]) == "a_b"
+
+
+@pytest.mark.parametrize("size,expected", [
+    (0, "0 B"),
+    (512, "512.0 B"),
+    (1024, "1.0 KB"),
+    (1024 * 1024, "1.0 MB"),
+    (1024 * 1024 * 1024, "1.0 GB"),
+    (1536, "1.5 KB"),
+])
+def test_format_file_size(size, expected):
+    """Test file size formatting."""
+    assert format_file_size(size) == expected
+
+
+def test_calculate_elapsed_time(monkeypatch):
+    """Test elapsed time calculation."""
+    # Fixed clock readings instead of a real sleep
+    times = iter([1000.0, 1000.25])
+    monkeypatch.setattr("src.core.utils.time.time", lambda: next(times))
     
-    def test_format_file_size(self):
-        """Test file size formatting."""
-        assert format_file_size(0) == "0 B"
-        assert format_file_size(512) == "512.0 B"
-        assert format_file_size(1024) == "1.0 KB"
-        assert format_file_size(1024 * 1024) == "1.0 MB"
-        assert format_file_size(1024 * 1024 * 1024) == "1.0 GB"
-        assert format_file_size(1536) == "1.5 KB"  # 1.5 KB
+    start_time = time.time()
+    elapsed = calculate_elapsed_time(start_time)
     
-    def test_calculate_elapsed_time(self):
-        """Test elapsed time calculation."""
-        import time
-        
-        start_time = time.time()
-        time.sleep(0.1)  # Sleep for 0.1 seconds
-        elapsed = calculate_elapsed_time(start_time)
-        
-        assert isinstance(elapsed, float)
-        assert 0.09 <= elapsed <= 0.2  # Should be around 0.1 seconds with some tolerance
+    assert isinstance(elapsed, float)
+    assert elapsed == pytest.approx(0.25)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_api_item():
-    """Sample API item for testing."""
+    """Sample API item for testing; shared read-only across the module."""
     return {
         "prdctClsfcNoFst": "10",
         "prdctClsfcNoScnd": "101",
@@ -148,21 +178,12 @@ def test_extract_g2b_params_complete(sample_api_item):
     """Test G2B parameter extraction with complete data."""
     params = extract_g2b_params(sample_api_item)
     
-    expected_keys = [
-        "prdctClsfcNoFst", "prdctClsfcNoScnd", "prdctClsfcNoThrd",
-        "prdctClsfcNoFrth", "prdctClsfcNoFfth", "prdctStndrdNo",
-        "mnfcturCmpnyNm", "mfgCmpnyNm", "mfgCmpnyNm2",
-        "mfgCmpnyNm3", "mfgCmpnyNm4", "mfgCmpnyNm5"
-    ]
-    
-    for key in expected_keys:
-        assert key in params
-        assert params[key] == sample_api_item.get(key, "")
+    missing = _EXPECTED_G2B_KEYS - params.keys()
+    assert not missing
+    assert {key: params[key] for key in _EXPECTED_G2B_KEYS} == {
+        key: sample_api_item.get(key, "") for key in _EXPECTED_G2B_KEYS
+    }
     
     # Should not include other fields
     assert "prdctNm" not in params
     assert "prdctPrc" not in params
-
-
-if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file